@@ -21,13 +21,23 @@ mpremote connect /dev/tty.usbserial-210 fs mkdir :games
 # Copy libs files
 mpremote connect /dev/tty.usbserial-210 fs cp libs/__init__.py :libs/__init__.py
 mpremote connect /dev/tty.usbserial-210 fs cp libs/tcs34725.py :libs/tcs34725.py
+mpremote connect /dev/tty.usbserial-210 fs cp libs/color_cal.py :libs/color_cal.py
+mpremote connect /dev/tty.usbserial-210 fs cp libs/color_filter.py :libs/color_filter.py
 mpremote connect /dev/tty.usbserial-210 fs cp libs/rgb_led.py :libs/rgb_led.py
 mpremote connect /dev/tty.usbserial-210 fs cp libs/button.py :libs/button.py
 mpremote connect /dev/tty.usbserial-210 fs cp libs/pot_dimmer.py :libs/pot_dimmer.py
+mpremote connect /dev/tty.usbserial-210 fs cp libs/hardware.py :libs/hardware.py
+mpremote connect /dev/tty.usbserial-210 fs cp libs/scheduler.py :libs/scheduler.py
+mpremote connect /dev/tty.usbserial-210 fs cp libs/runtime.py :libs/runtime.py
+mpremote connect /dev/tty.usbserial-210 fs cp libs/ui.py :libs/ui.py
+mpremote connect /dev/tty.usbserial-210 fs cp libs/fsm.py :libs/fsm.py
 mpremote connect /dev/tty.usbserial-210 fs cp libs/ili9341.py :libs/ili9341.py
+mpremote connect /dev/tty.usbserial-210 fs cp libs/rgb565.py :libs/rgb565.py
+mpremote connect /dev/tty.usbserial-210 fs cp libs/console.py :libs/console.py
 
 # Copy games files
 mpremote connect /dev/tty.usbserial-210 fs cp games/__init__.py :games/__init__.py
+mpremote connect /dev/tty.usbserial-210 fs cp games/common.py :games/common.py
 mpremote connect /dev/tty.usbserial-210 fs cp games/game1.py :games/game1.py
 mpremote connect /dev/tty.usbserial-210 fs cp games/game2.py :games/game2.py
 
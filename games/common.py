@@ -0,0 +1,33 @@
+from math import sqrt, floor
+from libs.ui import ui
+
+# ui.begin() keys for dashboards a newer copy replaces if still unsent
+HINT_FRAME = 1
+LIST_FRAME = 2
+
+
+def calculate_score(target, current):
+    tr, tg, tb = target
+    cr, cg, cb = current
+    error = sqrt((tr - cr) ** 2 + (tg - cg) ** 2 + (tb - cb) ** 2)
+    max_error = 441.67
+    return int(max(0, 100 - (error / max_error * 100)))
+
+
+def get_bar(value, width=15):
+    fill = floor((value / 255) * width)
+    bar = "#" * fill + "." * (width - fill)
+    return f"[{bar}]"
+
+
+def print_header(title):
+    ui.print("\n" + "=" * 50)
+    ui.print(title.center(50))
+    ui.print("=" * 50)
+
+
+def print_restart(message):
+    ui.print("\n" * 5)
+    ui.print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+    ui.print(f"!!!   {message:<21}!!!")
+    ui.print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
@@ -1,158 +1,184 @@
-from machine import Pin
-from libs import rgb_led, button, pot_dimmer
-from math import sqrt
-from time import sleep_ms
-
-
-def start_game(player_num=1):
-    restart_btn = button.Button(12, debounce_ms=100)  # LEFT → Restart
-    lock_btn = button.Button(4, debounce_ms=100)   # MIDDLE → Lock In
-    hint_btn = button.Button(16, debounce_ms=100)  # RIGHT → disabled in Game 2
-
-    rgb = rgb_led.RGBLED(15, 2, 17)
-    dimmer_map = {
-        "R": pot_dimmer.PotDimmer(32, 15),
-        "G": pot_dimmer.PotDimmer(33, 2),
-        "B": pot_dimmer.PotDimmer(35, 17)
-    }
-
-    target_colors = [
-        (255, 0, 0), (0, 255, 0), (0, 0, 255),
-        (255, 255, 0), (0, 255, 255)
-    ]
-
-    current_round = 0
-    score = 0
-
-    def normalize_pot_value(val):
-        if val > 255:
-            return int((val / 4095) * 255)
-        return int(val)
-
-    def calculate_score(target, current):
-        tr, tg, tb = target
-        cr, cg, cb = current
-        error = sqrt((tr - cr) ** 2 + (tg - cg) ** 2 + (tb - cb) ** 2)
-        max_error = 441.67
-        return int(max(0, 100 - (error / max_error * 100)))
-
-    def check_global_restart():
-        nonlocal GAME_STATE, current_round, score
-        if restart_btn.was_pressed():
-            print("\n" * 5)
-            print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-            print("!!!   GAME RESTARTING      !!!")
-            print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-            sleep_ms(500)
-            GAME_STATE = "START"
-            current_round = 0
-            score = 0
-
-    def print_target_info(round_num, total):
-        print("\n" + "=" * 50)
-        print(f"ROUND {round_num}/{total}".center(50))
-        print("=" * 50)
-        print("Watch the LED carefully!")
-        print("The color will appear for 5 seconds, then disappear.")
-        print("You must recreate it from memory.")
-        print("=" * 50)
-
-    def show_target_color(target, duration_ms=5000):
-        rgb.set_color(*target)
-        seconds = max(1, int(duration_ms / 1000))
-        for remaining in range(seconds, 0, -1):
-            print(f"Color visible for {remaining} more second{'s' if remaining > 1 else ''}...")
-            sleep_ms(1000)
-        rgb.set_color(0, 0, 0)
-        print("\nLED is now OFF! Recreate the color from memory.")
-
-    def print_round_result(current_score, round_num, total):
-        print("\n" + "=" * 50)
-        if current_score == 1:
-            print(f"Round {round_num} PASSED! (Accuracy ≥80%)")
-        else:
-            print(f"Round {round_num} FAILED (Accuracy <80%)")
-        print(f"Your progress: {score}/{total} rounds passed")
-        print("=" * 50)
-
-    def print_final_result():
-        print("\n" + "=" * 50)
-        print(f"GAME 2 COMPLETE - PLAYER {player_num}".center(50))
-        print("=" * 50)
-        print(f"Final score: {score}/{len(target_colors)} rounds passed")
-        percentage = int((score / len(target_colors)) * 100)
-        print(f"Success rate: {percentage}%")
-        print("=" * 50)
-        print("\n[Press RIGHT button to continue]")
-
-    print("\n\n")
-    print("=" * 50)
-    print("GAME 2: COLOR SCAVENGER HUNT".center(50))
-    print(f"PLAYER {player_num}".center(50))
-    print("=" * 50)
-    print("Watch the LED - you'll see a color for 5 seconds!")
-    print("Then recreate it from memory using the RGB knobs.")
-    print("You'll play 5 rounds. No hints available!")
-    print("-" * 50)
-    print("Controls:")
-    print("  • Turn RGB knobs to recreate the color")
-    print("  • MIDDLE button = Lock in your answer")
-    print("=" * 50)
-    print("\nReady to start...")
-    sleep_ms(1500)
-
-    GAME_STATE = "START"
-
-    while True:
-        check_global_restart()
-
-        if GAME_STATE == "START":
-            current_round = 0
-            score = 0
-            print("\n🎯 Get ready for the first color...")
-            sleep_ms(1000)
-            GAME_STATE = "ROUND"
-
-        elif GAME_STATE == "ROUND":
-            if current_round >= len(target_colors):
-                GAME_STATE = "END"
-                continue
-
-            target = target_colors[current_round]
-            print_target_info(current_round + 1, len(target_colors))
-            show_target_color(target)
-
-            round_done = False
-            while not round_done:
-                check_global_restart()
-                if hint_btn.was_pressed():
-                    print("\nHints are disabled in Game 2.")
-                r = normalize_pot_value(dimmer_map["R"].update())
-                g = normalize_pot_value(dimmer_map["G"].update())
-                b = normalize_pot_value(dimmer_map["B"].update())
-                current_rgb = (r, g, b)
-
-                if lock_btn.was_pressed():
-                    round_score = calculate_score(target, current_rgb)
-                    if round_score >= 80:
-                        score += 1
-                        print_round_result(1, current_round + 1, len(target_colors))
-                    else:
-                        print_round_result(0, current_round + 1, len(target_colors))
-                    current_round += 1
-                    if current_round < len(target_colors):
-                        print(f"\n🎯 Get ready for Round {current_round + 1}...")
-                        sleep_ms(1000)
-                    round_done = True
-
-                sleep_ms(50)
-
-        elif GAME_STATE == "END":
-            print_final_result()
-            while True:
-                check_global_restart()
-                if hint_btn.was_pressed():
-                    print("\nMoving on...")
-                    sleep_ms(500)
-                    return score
-                sleep_ms(50)
+from libs.fsm import Machine, State, Pause
+from libs.runtime import LOCK, HINT
+from libs.ui import ui
+from games.common import calculate_score, print_restart
+
+# State keys (index into Game2.states)
+INTRO, START, ROUND, SHOW, MIXING, NEXT_ROUND, END, LEAVING, RESTARTING = range(9)
+
+target_colors = [
+    (255, 0, 0), (0, 255, 0), (0, 0, 255),
+    (255, 255, 0), (0, 255, 255)
+]
+
+
+def print_target_info(round_num, total):
+    ui.print("\n" + "=" * 50)
+    ui.print(f"ROUND {round_num}/{total}".center(50))
+    ui.print("=" * 50)
+    ui.print("Watch the LED carefully!")
+    ui.print("The color will appear for 5 seconds, then disappear.")
+    ui.print("You must recreate it from memory.")
+    ui.print("=" * 50)
+
+
+def print_round_result(current_score, score, round_num, total):
+    ui.print("\n" + "=" * 50)
+    if current_score == 1:
+        ui.print(f"Round {round_num} PASSED! (Accuracy ≥80%)")
+    else:
+        ui.print(f"Round {round_num} FAILED (Accuracy <80%)")
+    ui.print(f"Your progress: {score}/{total} rounds passed")
+    ui.print("=" * 50)
+
+
+def print_final_result(player_num, score):
+    ui.print("\n" + "=" * 50)
+    ui.print(f"GAME 2 COMPLETE - PLAYER {player_num}".center(50))
+    ui.print("=" * 50)
+    ui.print(f"Final score: {score}/{len(target_colors)} rounds passed")
+    percentage = int((score / len(target_colors)) * 100)
+    ui.print(f"Success rate: {percentage}%")
+    ui.print("=" * 50)
+    ui.print("\n[Press RIGHT button to continue]")
+
+
+class Intro(State):
+    def enter(self, m):
+        ui.print("\n\n")
+        ui.print("=" * 50)
+        ui.print("GAME 2: COLOR SCAVENGER HUNT".center(50))
+        ui.print(f"PLAYER {m.player_num}".center(50))
+        ui.print("=" * 50)
+        ui.print("Watch the LED - you'll see a color for 5 seconds!")
+        ui.print("Then recreate it from memory using the RGB knobs.")
+        ui.print("You'll play 5 rounds. No hints available!")
+        ui.print("-" * 50)
+        ui.print("Controls:")
+        ui.print("  • Turn RGB knobs to recreate the color")
+        ui.print("  • MIDDLE button = Lock in your answer")
+        ui.print("=" * 50)
+        ui.print("\nReady to start...")
+
+    def tick(self, m):
+        if m.after(1500):
+            return START
+        return None
+
+
+class Start(State):
+    def enter(self, m):
+        m.current_round = 0
+        m.score = 0
+        ui.print("\n🎯 Get ready for the first color...")
+
+    def tick(self, m):
+        if m.after(1000):
+            return ROUND
+        return None
+
+
+class Round(State):
+    def tick(self, m):
+        if m.current_round >= len(target_colors):
+            return END
+        print_target_info(m.current_round + 1, len(target_colors))
+        return SHOW
+
+
+class Show(State):
+    """Show the target for duration_ms with a once-a-second countdown."""
+
+    def __init__(self, duration_ms=5000):
+        self.seconds = max(1, int(duration_ms / 1000))
+
+    def enter(self, m):
+        m.rt.hw.rgb.set_color(*target_colors[m.current_round])
+        self.shown = 0
+
+    def tick(self, m):
+        if not m.after(self.shown * 1000):
+            return None
+        if self.shown < self.seconds:
+            remaining = self.seconds - self.shown
+            ui.print(f"Color visible for {remaining} more second{'s' if remaining > 1 else ''}...")
+            self.shown += 1
+            return None
+        m.rt.hw.rgb.set_color(0, 0, 0)
+        ui.print("\nLED is now OFF! Recreate the color from memory.")
+        return MIXING
+
+
+class Mixing(State):
+    def enter(self, m):
+        m.rt.clear(LOCK, HINT)
+        m.rt.follow_mix = True  # LED shows the knobs while mixing
+
+    def tick(self, m):
+        rt = m.rt
+        if rt.take(LOCK):
+            round_score = calculate_score(target_colors[m.current_round], rt.mix)
+            if round_score >= 80:
+                m.score += 1
+                print_round_result(1, m.score, m.current_round + 1, len(target_colors))
+            else:
+                print_round_result(0, m.score, m.current_round + 1, len(target_colors))
+            m.current_round += 1
+            if m.current_round < len(target_colors):
+                ui.print(f"\n🎯 Get ready for Round {m.current_round + 1}...")
+                return NEXT_ROUND
+            return ROUND
+        if rt.take(HINT):
+            ui.print("\nHints are disabled in Game 2.")
+        return None
+
+    def exit(self, m):
+        m.rt.follow_mix = False
+
+
+class End(State):
+    def enter(self, m):
+        print_final_result(m.player_num, m.score)
+        m.rt.clear(LOCK, HINT)
+
+    def tick(self, m):
+        if m.rt.take(HINT):
+            ui.print("\nMoving on...")
+            return LEAVING
+        return None
+
+
+class Leaving(State):
+    def tick(self, m):
+        if m.after(500):
+            m.finish(m.score)
+        return None
+
+
+class Game2(Machine):
+    def __init__(self, rt, player_num):
+        super().__init__(rt, [
+            Intro(),  # INTRO
+            Start(),  # START
+            Round(),  # ROUND
+            Show(),  # SHOW
+            Mixing(),  # MIXING
+            Pause(1000, ROUND),  # NEXT_ROUND
+            End(),  # END
+            Leaving(),  # LEAVING
+            Pause(500, START),  # RESTARTING
+        ], INTRO)
+        self.player_num = player_num
+        self.current_round = 0
+        self.score = 0
+
+    def on_restart(self):
+        print_restart("GAME RESTARTING")
+        self.rt.hw.rgb.set_color(0, 0, 0)
+        return RESTARTING
+
+
+async def start_game(rt, player_num=1):
+    rt.hw.reset()
+    rt.clear()
+    return await Game2(rt, player_num).run()
@@ -1,32 +1,106 @@
-from machine import Pin
-import time
+from array import array
+from machine import Pin, disable_irq, enable_irq
+from .scheduler import ticks_ms, ticks_add, ticks_diff
 
 
 class Button:
-    def __init__(self, pin_number, debounce_ms=200):
+    def __init__(self, pin_number, debounce_ms=200, irq=False, queue_size=8):
         self.pin = Pin(pin_number, Pin.IN, Pin.PULL_UP)
         self.debounce_ms = debounce_ms
         self.last_press_time = 0
         self.last_state = 1
 
+        # Interrupt mode: presses are timestamped into a ring buffer by
+        # the ISR so none are lost while the main loop is blocked
+        self.irq = irq
+        self.press_time = 0  # Timestamp of the last press returned
+        self.dropped = 0  # Presses lost because the queue was full
+        if irq:
+            self._queue = array('l', [0] * queue_size)
+            self._head = 0
+            self._count = 0
+            # Time of the last edge; start as if released long enough ago
+            self.last_state = self.pin.value()
+            self._edge_time = ticks_add(ticks_ms(), -debounce_ms)
+            self.pin.irq(trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING,
+                         handler=self._isr, hard=True)
+
+    def _isr(self, pin):
+        # Hard IRQ: no allocation.  Every edge is timestamped; a press is
+        # the first edge after the line sat high and quiet for at least
+        # debounce_ms, so release bounce never counts as a press.  The
+        # level read here is only kept for the next edge: by the time the
+        # ISR runs a bouncing press may already read high again.  The
+        # last read of a burst is reliable, as no edge follows it.
+        now = ticks_ms()
+        quiet_ms = ticks_diff(now, self._edge_time)
+        was_high = self.last_state
+        self._edge_time = now
+        self.last_state = pin.value()
+        if not was_high or quiet_ms < self.debounce_ms:
+            return
+        self.last_press_time = now
+        queue = self._queue
+        if self._count == len(queue):
+            self.dropped += 1
+            return
+        queue[(self._head + self._count) % len(queue)] = now
+        self._count += 1
+
     def was_pressed(self):
         """
         Checks if the button was just pressed.
         Returns True ONLY on the moment of the press (Falling Edge).
+        In IRQ mode, consumes one queued press instead.
         """
+        if self.irq:
+            state = disable_irq()
+            pressed = self._count > 0
+            if pressed:
+                self.press_time = self._queue[self._head]
+                self._head = (self._head + 1) % len(self._queue)
+                self._count -= 1
+            enable_irq(state)
+            return pressed
+
         current_state = self.pin.value()
         is_pressed_now = False
 
         if current_state == 0 and self.last_state == 1:
 
-            current_time = time.ticks_ms()
-            if time.ticks_diff(current_time, self.last_press_time) > self.debounce_ms:
+            current_time = ticks_ms()
+            if ticks_diff(current_time, self.last_press_time) > self.debounce_ms:
                 self.last_press_time = current_time
+                self.press_time = current_time
                 is_pressed_now = True
 
         self.last_state = current_state
         return is_pressed_now
 
+    def events(self):
+        """
+        Returns the number of presses since the last call and clears
+        them. press_time is set to the newest one.
+        """
+        if not self.irq:
+            return 1 if self.was_pressed() else 0
+        state = disable_irq()
+        count = self._count
+        if count:
+            queue = self._queue
+            self.press_time = queue[(self._head + count - 1) % len(queue)]
+            self._head = 0
+            self._count = 0
+        enable_irq(state)
+        return count
+
+    def deinit(self):
+        """Removes the IRQ handler (IRQ mode) and drops queued presses."""
+        if self.irq:
+            self.pin.irq(handler=None)
+            self.irq = False
+            self._count = 0
+
     def is_held(self):
         """Returns True as long as the button is being held down."""
         return self.pin.value() == 0
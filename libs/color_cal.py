@@ -0,0 +1,120 @@
+"""Calibrated TCS34725 to sRGB conversion.
+
+A calibration is a white reference level plus a 3x3 matrix in fixed point.
+Raw channels are scaled by the exposure they were taken at and by the
+captured white level, so a white card reads 1.0 on every channel and a
+grey card proportionally less: intensity is kept, not just chromaticity.
+The matrix maps those values to linear RGB.  Applying it costs three
+integer divides and nine integer multiplies plus a table lookup per
+channel for the sRGB transfer curve.  Coefficients come from
+tools/fit_color_cal.py and are stored on flash as JSON.
+"""
+import json
+
+CAL_FILE = 'color_cal.json'
+SCALE_BITS = 12  # Matrix coefficients are Q12 (4096 == 1.0)
+_LIN_BITS = 12  # Linear values are Q12 (4096 == 1.0)
+_IDENTITY = (4096, 0, 0, 0, 4096, 0, 0, 0, 4096)
+
+
+def srgb_encode(x):
+    """Linear 0..1 to sRGB 0..1."""
+    if x <= 0.0031308:
+        return 12.92 * x
+    return 1.055 * pow(x, 1 / 2.4) - 0.055
+
+
+def srgb_decode(v):
+    """sRGB 0..1 to linear 0..1."""
+    if v <= 0.04045:
+        return v / 12.92
+    return pow((v + 0.055) / 1.055, 2.4)
+
+
+# Linear Q12 to 8-bit sRGB (4 KB).  Near black one Q12 step is under
+# 1 LSB of sRGB; Q10 steps there are 3 LSB
+_SRGB_LUT = bytes(int(srgb_encode(i / (1 << _LIN_BITS)) * 255 + 0.5)
+                  for i in range((1 << _LIN_BITS) + 1))
+
+
+class ColorCalibration:
+    """Sensor to sRGB conversion with a fixed-point 3x3 matrix.
+
+    Attributes:
+        matrix: Nine Q12 coefficients, row major.
+        white: (r, g, b) of the white reference in counts per ms per unit
+            gain (as tcs34725.normalize() gives), or None.  Without it
+            channels are divided by clear, which gives chromaticity only:
+            white, grey and black cards all come out the same.
+    """
+
+    def __init__(self, matrix=_IDENTITY, white=None):
+        if len(matrix) != 9:
+            raise ValueError("Matrix must have 9 coefficients")
+        if white is not None and (len(white) != 3 or min(white) <= 0):
+            raise ValueError("White level must be 3 positive values")
+        self.matrix = tuple(int(v) for v in matrix)
+        self.white = None if white is None else tuple(float(v) for v in white)
+        self._exposure = None
+        self._div = [1, 1, 1]  # White level in raw counts at _exposure
+
+    @classmethod
+    def from_floats(cls, rows, white=None):
+        """Build from a 3x3 float matrix (list of rows)."""
+        scale = 1 << SCALE_BITS
+        return cls([int(round(v * scale)) for row in rows for v in row],
+                   white)
+
+    @classmethod
+    def load(cls, path=CAL_FILE):
+        """Load a calibration saved with save()."""
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("scale_bits", SCALE_BITS) != SCALE_BITS:
+            raise ValueError("Unsupported calibration scale")
+        return cls(data["matrix"], data.get("white"))
+
+    def save(self, path=CAL_FILE):
+        data = {"scale_bits": SCALE_BITS, "matrix": list(self.matrix)}
+        if self.white is not None:
+            data["white"] = list(self.white)
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    def apply(self, data, exposure=None):
+        """Return calibrated 8-bit sRGB (r, g, b) for raw R,G,B,C data.
+
+        Args:
+            data: Raw (r, g, b, c) counts.
+            exposure: (gain, integration ms) the data was taken at, e.g.
+                TCS34725.exposure.  Required when a white level is set.
+        """
+        r, g, b, c = data
+        if self.white is None:
+            if c == 0:
+                return 0, 0, 0
+            div = (c, c, c)
+        else:
+            if exposure is None:
+                raise ValueError("Exposure needed with a white level")
+            if exposure != self._exposure:
+                # White level in counts at this exposure, once per change
+                gain, ms = exposure
+                self._div = [max(1, int(w * gain * ms + 0.5))
+                             for w in self.white]
+                self._exposure = exposure
+            div = self._div
+        # Channels relative to white (or clear) in Q12, rounded
+        r = ((r << _LIN_BITS) + (div[0] >> 1)) // div[0]
+        g = ((g << _LIN_BITS) + (div[1] >> 1)) // div[1]
+        b = ((b << _LIN_BITS) + (div[2] >> 1)) // div[2]
+        m = self.matrix
+        top = 1 << _LIN_BITS
+        lut = _SRGB_LUT
+        half = 1 << (SCALE_BITS - 1)
+        lr = (m[0] * r + m[1] * g + m[2] * b + half) >> SCALE_BITS
+        lg = (m[3] * r + m[4] * g + m[5] * b + half) >> SCALE_BITS
+        lb = (m[6] * r + m[7] * g + m[8] * b + half) >> SCALE_BITS
+        return (lut[max(0, min(top, lr))],
+                lut[max(0, min(top, lg))],
+                lut[max(0, min(top, lb))])
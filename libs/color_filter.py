@@ -0,0 +1,102 @@
+"""Temporal filtering for TCS34725 samples.
+
+Feed raw (r, g, b, c) samples, e.g. from TCS34725.poll(), and read back a
+median-of-N filtered, exponentially smoothed value plus a flag telling
+when the reading has settled.  All state lives in arrays allocated up
+front and the work per sample is fixed for a given window size.
+"""
+from array import array
+
+
+class ColorFilter:
+    """Median-of-N, EMA and settle detection for R,G,B,C samples.
+
+    The median over the last `window` samples rejects single-sample
+    outliers (a hand passing, a flicker peak).  The EMA then smooths what
+    is left with weight 1 / 2**ema_shift.  The reading counts as settled
+    once every channel's median has been within tolerance_pct percent of
+    the clear value from the smoothed value for settle_count samples in
+    a row, i.e. the EMA has caught up with what the sensor sees.
+    """
+
+    def __init__(self, window=5, ema_shift=2, tolerance_pct=2,
+                 settle_count=3):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.ema_shift = ema_shift
+        self.tolerance_pct = tolerance_pct
+        self.settle_count = settle_count
+        self._ring = array('H', [0] * (4 * window))  # 4 channels per slot
+        # The same samples kept sorted, one run of `window` per channel
+        self._sorted = array('H', [0] * (4 * window))
+        self._acc = array('l', [0] * 4)  # EMA accumulators << ema_shift
+        self.value = array('H', [0] * 4)  # Filtered R,G,B,C
+        self.reset()
+
+    def reset(self):
+        self._pos = 0
+        self._count = 0
+        self._stable = 0
+        self.settled = False
+
+    def _update(self, channel, old, new):
+        # Swap old for new in the channel's sorted run: close old's gap
+        # (only once the window is full), then shift larger values up to
+        # insert new.  O(window) instead of re-sorting every sample.
+        s = self._sorted
+        lo = channel * self.window
+        end = lo + self._count
+        if self._count == self.window:
+            i = lo
+            while s[i] != old:
+                i += 1
+            end -= 1
+            while i < end:
+                s[i] = s[i + 1]
+                i += 1
+        j = end - 1
+        while j >= lo and s[j] > new:
+            s[j + 1] = s[j]
+            j -= 1
+        s[j + 1] = new
+
+    def feed(self, sample):
+        """Add a raw (r, g, b, c) sample.
+
+        Returns:
+            array: Filtered R,G,B,C (self.value, reused between calls).
+        """
+        ring = self._ring
+        base = self._pos * 4
+        for ch in range(4):
+            self._update(ch, ring[base + ch], sample[ch])
+            ring[base + ch] = sample[ch]
+        self._pos = (self._pos + 1) % self.window
+        first = self._count == 0
+        if self._count < self.window:
+            self._count += 1
+
+        acc = self._acc
+        out = self.value
+        shift = self.ema_shift
+        limit = max(out[3], 1) * self.tolerance_pct
+        stable = True
+        s = self._sorted
+        mid = self._count >> 1
+        for ch in range(4):
+            m = s[ch * self.window + mid]
+            if first:
+                acc[ch] = m << shift
+            else:
+                acc[ch] += m - (acc[ch] >> shift)
+            v = acc[ch] >> shift
+            if abs(m - v) * 100 > limit:
+                stable = False
+            out[ch] = v
+        if first or not stable:
+            self._stable = 0
+        else:
+            self._stable += 1
+        self.settled = self._stable >= self.settle_count
+        return out
@@ -0,0 +1,102 @@
+"""Hardware-scrolled text console for the ILI9341."""
+
+
+class Console(object):
+    """Scrolling text console drawn with the built-in 8x8 font.
+
+    New lines overwrite the oldest row in frame memory and the vertical
+    scroll start address (VSCRSADD) is moved so that row appears at the
+    bottom.  Each line costs one block() plus one scroll command, with no
+    full-screen redraw.
+
+    Note:
+        Hardware scrolling moves along the panel's native 320 pixel axis,
+        so the display must be in portrait orientation (rotation=0).
+    """
+
+    def __init__(self, display, color=0xFFFF, background=0, top=0,
+                 bottom=0, line_height=8):
+        """Initialize console.
+
+        Args:
+            display (Display): ILI9341 display.
+            color (Optional int): RGB565 text color (default white).
+            background (Optional int): RGB565 background (default black).
+            top (Optional int): Fixed rows above the console (default 0).
+            bottom (Optional int): Fixed rows below the console (default 0).
+            line_height (Optional int): Pixels per line, at least 8
+                (default 8).
+        """
+        if line_height < 8:
+            raise ValueError('line_height must be at least 8.')
+        self.display = display
+        self.color = color
+        self.background = background
+        self.line_height = line_height
+        self.top = top
+        self.rows = (display.height - top - bottom) // line_height
+        if self.rows < 1:
+            raise ValueError('No room for a console line.')
+        self.cols = display.width // 8
+        # Round the scroll area down to whole lines
+        self.bottom = display.height - top - self.rows * line_height
+        display.set_scroll(top, self.bottom)
+        self.clear()
+
+    def clear(self):
+        """Blank the console area and reset scrolling."""
+        self.display.fill_hrect(0, self.top, self.display.width,
+                                self.rows * self.line_height,
+                                self.background)
+        self._row = 0  # Frame memory row that receives the next line
+        self._count = 0  # Lines on screen, up to self.rows
+        self.display.scroll(self.top)
+
+    def close(self):
+        """Restore a non-scrolled full-screen layout."""
+        self.display.set_scroll(0, 0)
+        self.display.scroll(0)
+
+    def write_line(self, text):
+        """Append a single line, truncated to the console width.
+
+        Args:
+            text (string): Line to append (no newlines).
+        """
+        display = self.display
+        lh = self.line_height
+        y = self.top + self._row * lh
+        # Pad to full width so the old contents of the row are erased
+        line = text[:self.cols]
+        line += ' ' * (self.cols - len(line))
+        display.draw_text8x8(0, y, line, self.color, self.background)
+        if lh > 8:
+            display.fill_hrect(0, y + 8, display.width, lh - 8,
+                               self.background)
+        self._row += 1
+        if self._row == self.rows:
+            self._row = 0
+        if self._count < self.rows:
+            self._count += 1
+        else:
+            # Oldest line was overwritten; show the next one at the top
+            display.scroll(self.top + self._row * lh)
+
+    def write(self, text):
+        """Append text, splitting on newlines and wrapping long lines.
+
+        A single trailing newline ends the last line rather than adding a
+        blank one, so print-style text ("foo\\n") takes one row.
+
+        Args:
+            text (string): Text to append.
+        """
+        cols = self.cols
+        if text.endswith('\n'):
+            text = text[:-1]
+        for line in text.split('\n'):
+            if not line:
+                self.write_line('')
+                continue
+            for i in range(0, len(line), cols):
+                self.write_line(line[i:i + cols])
@@ -0,0 +1,103 @@
+"""Table-driven state machines for the games.
+
+A game is a Machine subclass holding its variables and a table of State
+objects indexed by small integer keys.  The shared run() loop calls the
+current state's tick() once per frame; tick() never blocks and returns
+the key of the next state (or None to stay), so dispatch is one method
+call on the cached state object however many states the game has.
+Waits are states too (see Pause).  The LEFT restart button is handled
+here, for every game, through Machine.on_restart().
+"""
+from .runtime import RESTART, sleep_ms, ticks_ms, ticks_diff
+
+FRAME_MS = 20  # Machine tick period
+
+
+class State:
+    """One state.  Override any of the handlers; m is the Machine."""
+
+    def enter(self, m):
+        pass
+
+    def tick(self, m):
+        """Called every frame.  Return the next state's key to move on."""
+        return None
+
+    def exit(self, m):
+        pass
+
+
+class Pause(State):
+    """Do nothing for ms milliseconds, then go to state nxt."""
+
+    def __init__(self, ms, nxt):
+        self.ms = ms
+        self.nxt = nxt
+
+    def tick(self, m):
+        if m.after(self.ms):
+            return self.nxt
+        return None
+
+
+class Machine:
+    """State machine driven by the runtime.
+
+    Subclasses fill self.states (a list, indexed by state key) and may
+    override on_restart().  A state ends the machine with finish().
+
+    Attributes:
+        rt: The Runtime.
+        state: The current State object.
+        key: The current state's key.
+    """
+
+    def __init__(self, rt, states, initial):
+        self.rt = rt
+        self.states = states
+        self.initial = initial
+        self.state = None
+        self.key = None
+        self.entered = 0
+        self.done = False
+        self.result = None
+
+    def goto(self, key):
+        """Leave the current state (if any) and enter state key."""
+        if self.state is not None:
+            self.state.exit(self)
+        self.key = key
+        self.state = self.states[key]
+        self.entered = ticks_ms()
+        self.state.enter(self)
+
+    def after(self, ms):
+        """True once the current state has been active for ms."""
+        return ticks_diff(ticks_ms(), self.entered) >= ms
+
+    def finish(self, result=None):
+        """Stop the machine; run() returns result."""
+        self.done = True
+        self.result = result
+
+    def on_restart(self):
+        """LEFT was pressed.  Return a state key to jump to, or None."""
+        return None
+
+    async def run(self):
+        """Run from the initial state until a state calls finish()."""
+        rt = self.rt
+        self.done = False
+        self.goto(self.initial)
+        while not self.done:
+            if rt.take(RESTART):
+                nxt = self.on_restart()
+            else:
+                nxt = self.state.tick(self)
+            if nxt is not None:
+                self.goto(nxt)
+            await sleep_ms(FRAME_MS)
+        if self.state is not None:
+            self.state.exit(self)
+            self.state = None
+        return self.result
@@ -0,0 +1,52 @@
+"""Board wiring for the color mixing games.
+
+One Hardware object is created at boot and handed to every game, so the
+pins, PWM channels and ADCs are set up once.  Anything with the same
+attributes (restart_btn, lock_btn, hint_btn, rgb, pots) can stand in for
+it, e.g. a fake on the host.
+"""
+from .button import Button
+from .pot_dimmer import PotBank
+from .rgb_led import RGBLED
+
+RESTART_PIN = 12  # LEFT
+LOCK_PIN = 4  # MIDDLE
+HINT_PIN = 16  # RIGHT
+LED_PINS = (15, 2, 17)  # R, G, B
+POT_PINS = (32, 33, 35)  # R, G, B
+DEBOUNCE_MS = 100
+
+
+class Hardware:
+    def __init__(self, debounce_ms=DEBOUNCE_MS, irq=True):
+        self.restart_btn = Button(RESTART_PIN, debounce_ms, irq)
+        self.lock_btn = Button(LOCK_PIN, debounce_ms, irq)
+        self.hint_btn = Button(HINT_PIN, debounce_ms, irq)
+        self.rgb = RGBLED(*LED_PINS)
+        # The pots only sample; the LED pins belong to self.rgb
+        self.pots = PotBank(tuple((pin, None) for pin in POT_PINS))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def clear_buttons(self):
+        """Drop presses queued while nobody was listening."""
+        self.restart_btn.events()
+        self.lock_btn.events()
+        self.hint_btn.events()
+
+    def reset(self):
+        """Put the board in the state a game expects on entry."""
+        self.clear_buttons()
+        self.rgb.set_color(0, 0, 0)
+
+    def close(self):
+        """Release every IRQ, PWM and pin. The object is unusable after."""
+        self.restart_btn.deinit()
+        self.lock_btn.deinit()
+        self.hint_btn.deinit()
+        self.rgb.deinit()
+        self.pots.deinit()
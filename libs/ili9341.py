@@ -1,9 +1,14 @@
 """ILI9341 LCD/Touch module."""
+from array import array
+from collections import OrderedDict
 from time import sleep
 from math import cos, sin, pi, radians
 from sys import implementation
 from framebuf import FrameBuffer, RGB565  # type: ignore
 from micropython import const  # type: ignore
+from .rgb565 import rotate90, rotate180, rotate270
+
+PIXEL_BATCH = const(512)  # Pixels queued before a batch is flushed
 
 
 def color565(r, g, b):
@@ -17,6 +22,66 @@ def color565(r, g, b):
     return (r & 0xf8) << 8 | (g & 0xfc) << 3 | b >> 3
 
 
+class GlyphCache(object):
+    """LRU cache of rendered RGB565 buffers bounded by a byte budget.
+
+    Entries are (buf, w, h) tuples; only the buffer counts against the
+    budget.  hits, misses and evictions are kept for tuning.
+    """
+
+    def __init__(self, max_bytes=4096):
+        """Initialize cache.
+
+        Args:
+            max_bytes (Optional int): Byte budget for cached buffers
+                (default 4096).
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        self._entries = OrderedDict()
+        self.size = 0
+
+    def get(self, key):
+        """Return the cached entry for key, or None, updating recency."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries[key] = entry  # Re-insert as most recently used
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        """Store an entry, evicting least recently used ones to fit.
+
+        Args:
+            key (tuple): Cache key.
+            entry (tuple): (buf, w, h) to store.
+        """
+        nbytes = len(entry[0])
+        if nbytes > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old[0])
+        while self.size + nbytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self.size -= len(self._entries.pop(oldest)[0])
+            self.evictions += 1
+        self._entries[key] = entry
+        self.size += nbytes
+
+
 class Display(object):
     """Serial interface for 16-bit color (5-6-5 RGB) IL9341 display.
 
@@ -127,6 +192,30 @@ class Display(object):
         self.offset = bool(x_offset or y_offset)
         self.x_offset = x_offset
         self.y_offset = y_offset
+        # Off-screen buffer (disabled until buffer_on is called)
+        self._fb = None
+        self._fb_filled = False
+        self._dirty = []
+        # Rendered text caches (disabled until text_cache_on is called)
+        self.glyph_cache = None
+        self.label_cache = None
+        # Pixel batch (packed y << 16 | x) and solid color line buffer
+        self._pixels = array('i', range(PIXEL_BATCH))
+        self._pixel_count = 0
+        self._pixel_color = 0
+        self._line = bytearray(max(width, height) * 2)
+        self._line_mv = memoryview(self._line)
+        self._line_color = 0
+        # Preallocated command buffers so the MicroPython command path and
+        # block() never touch the heap
+        self._cmd = bytearray(1)
+        self._args = bytearray(16)
+        args_mv = memoryview(self._args)
+        self._args_views = [args_mv[:i] for i in range(len(self._args) + 1)]
+        self._window = bytearray(4)
+        self._cmd_column = bytearray([self.SET_COLUMN])
+        self._cmd_page = bytearray([self.SET_PAGE])
+        self._cmd_ram = bytearray([self.WRITE_RAM])
 
         # Initialize GPIO pins and set implementation specific methods
         if implementation.name == 'circuitpython':
@@ -136,6 +225,7 @@ class Display(object):
             self.reset = self.reset_cpy
             self.write_cmd = self.write_cmd_cpy
             self.write_data = self.write_data_cpy
+            self._write_block = self._write_block_cpy
         else:
             self.cs.init(self.cs.OUT, value=1)
             self.dc.init(self.dc.OUT, value=0)
@@ -143,6 +233,7 @@ class Display(object):
             self.reset = self.reset_mpy
             self.write_cmd = self.write_cmd_mpy
             self.write_data = self.write_data_mpy
+            self._write_block = self._write_block_mpy
         self.reset()
         # Send initialization commands
         self.write_cmd(self.SWRESET)  # Software reset
@@ -186,7 +277,17 @@ class Display(object):
             x1 (int):  Ending X position.
             y1 (int):  Ending Y position.
             data (bytes): Data buffer to write.
+        Note:
+            When the off-screen buffer is on, blocks that land entirely
+            inside the buffered region are only copied to RAM and marked
+            dirty.  They reach the panel on the next flush().
         """
+        if self._fb is not None and self._buffer_block(x0, y0, x1, y1, data):
+            return
+        self._write_block(x0, y0, x1, y1, data)
+
+    def _write_block_cpy(self, x0, y0, x1, y1, data):
+        """Send a block of data straight to the panel (CircuitPython)."""
         if self.offset:  # Add offset if specified
             x0 += self.x_offset
             x1 += self.x_offset
@@ -200,8 +301,384 @@ class Display(object):
         self.write_cmd(self.WRITE_RAM)
         self.write_data(data)
 
+    def _write_block_mpy(self, x0, y0, x1, y1, data):
+        """Send a block of data straight to the panel (MicroPython).
+
+        The address window and memory write go out under a single CS
+        assertion, built in preallocated buffers (no heap allocation).
+        """
+        if self.offset:  # Add offset if specified
+            x0 += self.x_offset
+            x1 += self.x_offset
+            y0 += self.y_offset
+            y1 += self.y_offset
+        spi = self.spi
+        dc = self.dc
+        window = self._window
+        self.cs(0)
+        dc(0)
+        spi.write(self._cmd_column)
+        window[0] = x0 >> 8
+        window[1] = x0 & 0xff
+        window[2] = x1 >> 8
+        window[3] = x1 & 0xff
+        dc(1)
+        spi.write(window)
+        dc(0)
+        spi.write(self._cmd_page)
+        window[0] = y0 >> 8
+        window[1] = y0 & 0xff
+        window[2] = y1 >> 8
+        window[3] = y1 & 0xff
+        dc(1)
+        spi.write(window)
+        dc(0)
+        spi.write(self._cmd_ram)
+        dc(1)
+        spi.write(data)
+        self.cs(1)
+
+    def buffer_on(self, x=0, y=0, w=None, h=None, max_rects=8, color=None):
+        """Start drawing into an off-screen RGB565 buffer.
+
+        Args:
+            x (Optional int): Left of buffered region (default 0).
+            y (Optional int): Top of buffered region (default 0).
+            w (Optional int): Width of buffered region (default full width).
+            h (Optional int): Height of buffered region (default full height).
+            max_rects (Optional int): Dirty rectangles kept before they
+                are merged or flushed (default 8).
+            color (Optional int): RGB565 background to fill the buffer
+                with (default None, buffer contents undefined).
+        Note:
+            A full 240x320 buffer needs 150 KB, which only fits on boards
+            with PSRAM.  Use a band (e.g. w=240, h=64) otherwise.  Drawing
+            outside the band still goes straight to the panel.
+
+            Without a background color only pixels actually drawn are
+            ever flushed: rectangles are merged only when the merged box
+            covers nothing else, and once more than max_rects are pending
+            the oldest is pushed to the panel early.  With a color the
+            whole buffer is defined, so the pair whose bounding box wastes
+            the fewest pixels is merged instead (those pixels show color).
+        """
+        if w is None:
+            w = self.width - x
+        if h is None:
+            h = self.height - y
+        if w <= 0 or h <= 0 or self.is_off_grid(x, y, x + w - 1, y + h - 1):
+            raise ValueError('Buffer region must lie on the display.')
+        self.buffer_off(flush=False)
+        self._fb = bytearray(w * h * 2)
+        self._fb_mv = memoryview(self._fb)
+        self._fb_filled = color is not None
+        if self._fb_filled and color:
+            # Row by row from the line buffer, no full-size temporary
+            line = self._color_line(color, w)
+            row = w * 2
+            for i in range(0, h * row, row):
+                self._fb_mv[i:i + row] = line
+        self._fb_x = x
+        self._fb_y = y
+        self._fb_w = w
+        self._fb_h = h
+        # Scratch used by flush() to gather rows of narrow rectangles
+        self._fb_scratch = bytearray(max(2048, w * 2))
+        self._max_rects = max(1, max_rects)
+        self._dirty = []
+
+    def buffer_off(self, flush=True):
+        """Stop buffering and release the off-screen buffer.
+
+        Args:
+            flush (Optional bool): Push pending dirty regions first
+                (default True).
+        """
+        if self._fb is None:
+            return
+        if flush:
+            self.flush()
+        self._fb = None
+        self._fb_mv = None
+        self._fb_scratch = None
+        self._dirty = []
+
+    def flush(self):
+        """Push the merged dirty rectangles of the buffer to the panel.
+
+        Returns:
+            int: Number of blocks written.
+        """
+        if self._fb is None or not self._dirty:
+            return 0
+        count = 0
+        for x0, y0, x1, y1 in self._dirty:
+            count += self._flush_rect(x0, y0, x1, y1)
+        self._dirty = []
+        return count
+
+    def _flush_rect(self, x0, y0, x1, y1):
+        """Push one rectangle of the buffer to the panel.
+
+        Returns:
+            int: Number of blocks written.
+        """
+        fb = self._fb_mv
+        fy = self._fb_y
+        fw = self._fb_w
+        n = (x1 - x0 + 1) * 2
+        if n == fw * 2:
+            # Full-width rows are contiguous in the buffer
+            start = (y0 - fy) * n
+            self._write_block(x0, y0, x1, y1,
+                              fb[start:start + (y1 - y0 + 1) * n])
+            return 1
+        scratch = self._fb_scratch
+        scratch_mv = memoryview(scratch)
+        rows = len(scratch) // n
+        count = 0
+        y = y0
+        while y <= y1:
+            chunk = min(rows, y1 - y + 1)
+            pos = 0
+            src = ((y - fy) * fw + (x0 - self._fb_x)) * 2
+            for _ in range(chunk):
+                scratch_mv[pos:pos + n] = fb[src:src + n]
+                pos += n
+                src += fw * 2
+            self._write_block(x0, y, x1, y + chunk - 1, scratch_mv[:pos])
+            count += 1
+            y += chunk
+        return count
+
+    def _buffer_block(self, x0, y0, x1, y1, data):
+        """Copy a block into the off-screen buffer.
+
+        Returns:
+            bool: True if the block was fully buffered, False if it must
+            still be written to the panel.
+        """
+        fx = self._fb_x
+        fy = self._fb_y
+        fx1 = fx + self._fb_w - 1
+        fy1 = fy + self._fb_h - 1
+        # Intersection with buffered region
+        ix0 = max(x0, fx)
+        iy0 = max(y0, fy)
+        ix1 = min(x1, fx1)
+        iy1 = min(y1, fy1)
+        if ix0 > ix1 or iy0 > iy1:
+            return False
+        fb = self._fb_mv
+        fw2 = self._fb_w * 2
+        src_w = (x1 - x0 + 1) * 2
+        n = (ix1 - ix0 + 1) * 2
+        src = memoryview(data)
+        if n == fw2 and n == src_w:
+            # Whole rows of the buffer: one contiguous copy
+            d = (iy0 - fy) * fw2
+            s = (iy0 - y0) * src_w
+            size = (iy1 - iy0 + 1) * n
+            fb[d:d + size] = src[s:s + size]
+        else:
+            s = (iy0 - y0) * src_w + (ix0 - x0) * 2
+            d = (iy0 - fy) * fw2 + (ix0 - fx) * 2
+            for _ in range(iy1 - iy0 + 1):
+                fb[d:d + n] = src[s:s + n]
+                s += src_w
+                d += fw2
+        if ix0 == x0 and iy0 == y0 and ix1 == x1 and iy1 == y1:
+            self._mark_dirty(x0, y0, x1, y1)
+            return True
+        # Partially buffered: the caller writes it directly, and the
+        # buffer already holds the same pixels so it stays coherent.
+        return False
+
+    def _mark_dirty(self, x0, y0, x1, y1):
+        """Add a rectangle to the dirty list, merging where that is exact."""
+        rects = self._dirty
+        i = 0
+        while i < len(rects):
+            r = rects[i]
+            if x0 >= r[0] and y0 >= r[1] and x1 <= r[2] and y1 <= r[3]:
+                return  # Already covered
+            if (r[0] >= x0 and r[1] >= y0 and r[2] <= x1 and r[3] <= y1) or (
+                    # Same columns, rows overlap or touch
+                    r[0] == x0 and r[2] == x1 and
+                    y0 <= r[3] + 1 and r[1] <= y1 + 1) or (
+                    # Same rows, columns overlap or touch
+                    r[1] == y0 and r[3] == y1 and
+                    x0 <= r[2] + 1 and r[0] <= x1 + 1):
+                x0 = min(x0, r[0])
+                y0 = min(y0, r[1])
+                x1 = max(x1, r[2])
+                y1 = max(y1, r[3])
+                rects.pop(i)
+                i = 0  # Grown rectangle may now merge with earlier ones
+            else:
+                i += 1
+        rects.append([x0, y0, x1, y1])
+        if not self._fb_filled:
+            while len(rects) > self._max_rects:
+                # Nothing to merge without flushing undrawn pixels
+                self._flush_rect(*rects.pop(0))
+            return
+        while len(rects) > self._max_rects:
+            # Merge the pair whose bounding box wastes the fewest pixels
+            best = None
+            for a in range(len(rects)):
+                ra = rects[a]
+                area_a = (ra[2] - ra[0] + 1) * (ra[3] - ra[1] + 1)
+                for b in range(a + 1, len(rects)):
+                    rb = rects[b]
+                    area_b = (rb[2] - rb[0] + 1) * (rb[3] - rb[1] + 1)
+                    waste = ((max(ra[2], rb[2]) - min(ra[0], rb[0]) + 1) *
+                             (max(ra[3], rb[3]) - min(ra[1], rb[1]) + 1) -
+                             area_a - area_b)
+                    if best is None or waste < best[0]:
+                        best = (waste, a, b)
+            _, a, b = best
+            rb = rects.pop(b)
+            ra = rects.pop(a)
+            self._mark_dirty(min(ra[0], rb[0]), min(ra[1], rb[1]),
+                             max(ra[2], rb[2]), max(ra[3], rb[3]))
+
+    def _color_line(self, color, n):
+        """Return n pixels of a solid color from the shared line buffer."""
+        if color != self._line_color:
+            self._line[:] = color.to_bytes(2, 'big') * (len(self._line) // 2)
+            self._line_color = color
+        return self._line_mv[:n * 2]
+
+    def _begin_pixels(self, color):
+        """Start a pixel batch and return the function that queues pixels."""
+        self._pixel_count = 0
+        self._pixel_color = color
+        return self._plot
+
+    def _plot(self, x, y):
+        """Queue a pixel of the current batch, dropping off-grid pixels."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            n = self._pixel_count
+            if n == PIXEL_BATCH:
+                self._end_pixels()
+                n = 0
+            self._pixels[n] = y << 16 | x
+            self._pixel_count = n + 1
+
+    def _end_pixels(self):
+        """Write the queued pixels grouped into horizontal/vertical runs.
+
+        Pixels are sorted by row and merged into horizontal runs.  Pixels
+        left on their own are sorted by column and merged into vertical
+        runs, so each run costs a single block() call.
+        """
+        n = self._pixel_count
+        self._pixel_count = 0
+        if not n:
+            return
+        color = self._pixel_color
+        keys = sorted(memoryview(self._pixels)[:n])
+        singles = []
+        i = 0
+        while i < n:
+            first = keys[i]
+            last = first
+            i += 1
+            while i < n and keys[i] - last <= 1 and keys[i] >> 16 == first >> 16:
+                last = keys[i]
+                i += 1
+            if last == first:
+                # Re-pack as x << 16 | y for the vertical pass
+                singles.append((first & 0xFFFF) << 16 | first >> 16)
+            else:
+                x = first & 0xFFFF
+                y = first >> 16
+                w = (last & 0xFFFF) - x + 1
+                self.block(x, y, x + w - 1, y, self._color_line(color, w))
+        singles.sort()
+        n = len(singles)
+        i = 0
+        while i < n:
+            first = singles[i]
+            last = first
+            i += 1
+            while (i < n and singles[i] - last <= 1 and
+                   singles[i] >> 16 == first >> 16):
+                last = singles[i]
+                i += 1
+            x = first >> 16
+            y = first & 0xFFFF
+            h = (last & 0xFFFF) - y + 1
+            self.block(x, y, x, y + h - 1, self._color_line(color, h))
+
+    def _letter(self, letter, font, color, background, landscape,
+                rotate_180):
+        """Return (buf, w, h) for a letter, from the glyph cache if on."""
+        cache = self.glyph_cache
+        if cache is not None:
+            key = (font, letter, color, background, landscape, rotate_180)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry
+        buf, w, h = font.get_letter(letter, color, background, landscape)
+        if rotate_180:
+            # Reverse pixel order, keeping each color565 byte pair intact
+            buf = rotate180(buf)
+        if cache is not None and w:
+            cache.put(key, (buf, w, h))
+        return buf, w, h
+
+    def _compose_label(self, text, font, color, background, landscape,
+                       rotate_180, spacing):
+        """Render a whole string into one buffer laid out like draw_text.
+
+        Returns:
+            (bytearray, int, int): Buffer, block width and block height.
+        """
+        letters = []
+        total = 0
+        height = 0
+        for letter in (reversed(text) if rotate_180 else text):
+            buf, w, h = self._letter(letter, font, color, background,
+                                     landscape, rotate_180)
+            if w == 0 or h == 0:
+                break
+            letters.append((buf, w, h))
+            total += w + spacing
+            height = max(height, h)
+        if not letters:
+            return bytearray(0), 0, 0
+        if landscape:
+            # Letters are stacked upwards: last letter is on top and each
+            # letter sits below its spacing rows
+            bw, bh = height, total
+        else:
+            bw, bh = total, height
+        if background:
+            out = bytearray(background.to_bytes(2, 'big') * (bw * bh))
+        else:
+            out = bytearray(bw * bh * 2)
+        dst = memoryview(out)
+        pos = 0
+        for buf, w, h in (reversed(letters) if landscape else letters):
+            if landscape:
+                # Glyph rows are the full block width: one copy
+                pos += spacing * bw * 2
+                dst[pos:pos + len(buf)] = buf
+                pos += len(buf)
+            else:
+                row = w * 2
+                d = pos * 2
+                for r in range(h):
+                    dst[d:d + row] = buf[r * row:(r + 1) * row]
+                    d += bw * 2
+                pos += w + spacing
+        return out, bw, bh
+
     def cleanup(self):
         """Clean up resources."""
+        self.buffer_off(flush=False)
         self.clear()
         self.display_off()
         self.spi.deinit()
@@ -255,10 +732,11 @@ class Display(object):
         dy = -r - r
         x = 0
         y = r
-        self.draw_pixel(x0, y0 + r, color)
-        self.draw_pixel(x0, y0 - r, color)
-        self.draw_pixel(x0 + r, y0, color)
-        self.draw_pixel(x0 - r, y0, color)
+        plot = self._begin_pixels(color)
+        plot(x0, y0 + r)
+        plot(x0, y0 - r)
+        plot(x0 + r, y0)
+        plot(x0 - r, y0)
         while x < y:
             if f >= 0:
                 y -= 1
@@ -267,14 +745,15 @@ class Display(object):
             x += 1
             dx += 2
             f += dx
-            self.draw_pixel(x0 + x, y0 + y, color)
-            self.draw_pixel(x0 - x, y0 + y, color)
-            self.draw_pixel(x0 + x, y0 - y, color)
-            self.draw_pixel(x0 - x, y0 - y, color)
-            self.draw_pixel(x0 + y, y0 + x, color)
-            self.draw_pixel(x0 - y, y0 + x, color)
-            self.draw_pixel(x0 + y, y0 - x, color)
-            self.draw_pixel(x0 - y, y0 - x, color)
+            plot(x0 + x, y0 + y)
+            plot(x0 - x, y0 + y)
+            plot(x0 + x, y0 - y)
+            plot(x0 - x, y0 - y)
+            plot(x0 + y, y0 + x)
+            plot(x0 - y, y0 + x)
+            plot(x0 + y, y0 - x)
+            plot(x0 - y, y0 - x)
+        self._end_pixels()
 
     def draw_ellipse(self, x0, y0, a, b, color):
         """Draw an ellipse.
@@ -298,11 +777,12 @@ class Display(object):
         y = b
         px = 0
         py = twoa2 * y
+        plot = self._begin_pixels(color)
         # Plot initial points
-        self.draw_pixel(x0 + x, y0 + y, color)
-        self.draw_pixel(x0 - x, y0 + y, color)
-        self.draw_pixel(x0 + x, y0 - y, color)
-        self.draw_pixel(x0 - x, y0 - y, color)
+        plot(x0 + x, y0 + y)
+        plot(x0 - x, y0 + y)
+        plot(x0 + x, y0 - y)
+        plot(x0 - x, y0 - y)
         # Region 1
         p = round(b2 - (a2 * b) + (0.25 * a2))
         while px < py:
@@ -314,10 +794,10 @@ class Display(object):
                 y -= 1
                 py -= twoa2
                 p += b2 + px - py
-            self.draw_pixel(x0 + x, y0 + y, color)
-            self.draw_pixel(x0 - x, y0 + y, color)
-            self.draw_pixel(x0 + x, y0 - y, color)
-            self.draw_pixel(x0 - x, y0 - y, color)
+            plot(x0 + x, y0 + y)
+            plot(x0 - x, y0 + y)
+            plot(x0 + x, y0 - y)
+            plot(x0 - x, y0 - y)
         # Region 2
         p = round(b2 * (x + 0.5) * (x + 0.5) +
                   a2 * (y - 1) * (y - 1) - a2 * b2)
@@ -330,10 +810,11 @@ class Display(object):
                 x += 1
                 px += twob2
                 p += a2 - py + px
-            self.draw_pixel(x0 + x, y0 + y, color)
-            self.draw_pixel(x0 - x, y0 + y, color)
-            self.draw_pixel(x0 + x, y0 - y, color)
-            self.draw_pixel(x0 - x, y0 - y, color)
+            plot(x0 + x, y0 + y)
+            plot(x0 - x, y0 + y)
+            plot(x0 + x, y0 - y)
+            plot(x0 - x, y0 - y)
+        self._end_pixels()
 
     def draw_hline(self, x, y, w, color):
         """Draw a horizontal line.
@@ -381,6 +862,37 @@ class Display(object):
                            x2, chunk_y + remainder - 1,
                            buf)
 
+    def draw_label(self, x, y, text, font, color, background=0,
+                   landscape=False, rotate_180=False, spacing=1):
+        """Draw text as a single block, caching the rendered label.
+
+        Args:
+            Same as draw_text.
+        Returns:
+            (int, int): Width and height of the drawn block.
+        Note:
+            Intended for static labels that are redrawn often.  Without
+            text_cache_on() the label is composed but not kept.
+        """
+        cache = self.label_cache
+        key = (font, text, color, background, landscape, rotate_180, spacing)
+        entry = cache.get(key) if cache is not None else None
+        if entry is None:
+            entry = self._compose_label(text, font, color, background,
+                                        landscape, rotate_180, spacing)
+            if cache is not None:
+                cache.put(key, entry)
+        buf, w, h = entry
+        if w == 0:
+            return 0, 0
+        if landscape:
+            # Text runs upwards from y, as in draw_text
+            y -= h
+        if self.is_off_grid(x, y, x + w - 1, y + h - 1):
+            return 0, 0
+        self.block(x, y, x + w - 1, y + h - 1, buf)
+        return w, h
+
     def draw_letter(self, x, y, letter, font, color, background=0,
                     landscape=False, rotate_180=False):
         """Draw a letter.
@@ -395,20 +907,8 @@ class Display(object):
             landscape (bool): Orientation (default: False = portrait)
             rotate_180 (bool): Rotate text by 180 degrees
         """
-        buf, w, h = font.get_letter(letter, color, background, landscape)
-        if rotate_180:
-            # Manually rotate the buffer by 180 degrees
-            # ensure bytes pairs for each pixel retain color565
-            new_buf = bytearray(len(buf))
-            num_pixels = len(buf) // 2
-            for i in range(num_pixels):
-                # The index for the new buffer's byte pair
-                new_idx = (num_pixels - 1 - i) * 2
-                # The index for the original buffer's byte pair
-                old_idx = i * 2
-                # Swap the pixels
-                new_buf[new_idx], new_buf[new_idx + 1] = buf[old_idx], buf[old_idx + 1]
-            buf = new_buf
+        buf, w, h = self._letter(letter, font, color, background,
+                                 landscape, rotate_180)
 
         # Check for errors (Font could be missing specified letter)
         if w == 0:
@@ -473,16 +973,19 @@ class Display(object):
         error = dx >> 1
         ystep = 1 if y1 < y2 else -1
         y = y1
+        dy = abs(dy)
+        plot = self._begin_pixels(color)
         for x in range(x1, x2 + 1):
             # Had to reverse HW ????
             if not is_steep:
-                self.draw_pixel(x, y, color)
+                plot(x, y)
             else:
-                self.draw_pixel(y, x, color)
-            error -= abs(dy)
+                plot(y, x)
+            error -= dy
             if error < 0:
                 y += ystep
                 error += dx
+        self._end_pixels()
 
     def draw_lines(self, coords, color):
         """Draw multiple lines.
@@ -641,29 +1144,11 @@ class Display(object):
         if rotate == 0:
             self.block(x, y, x + w - 1, y + (h - 1), buf)
         elif rotate == 90:
-            buf2 = bytearray(w * 16)
-            fbuf2 = FrameBuffer(buf2, h, w, RGB565)
-            for y1 in range(h):
-                for x1 in range(w):
-                    fbuf2.pixel(y1, x1,
-                                fbuf.pixel(x1, (h - 1) - y1))
-            self.block(x, y, x + (h - 1), y + w - 1, buf2)
+            self.block(x, y, x + (h - 1), y + w - 1, rotate90(buf, w, h))
         elif rotate == 180:
-            buf2 = bytearray(w * 16)
-            fbuf2 = FrameBuffer(buf2, w, h, RGB565)
-            for y1 in range(h):
-                for x1 in range(w):
-                    fbuf2.pixel(x1, y1,
-                                fbuf.pixel((w - 1) - x1, (h - 1) - y1))
-            self.block(x, y, x + w - 1, y + (h - 1), buf2)
+            self.block(x, y, x + w - 1, y + (h - 1), rotate180(buf))
         elif rotate == 270:
-            buf2 = bytearray(w * 16)
-            fbuf2 = FrameBuffer(buf2, h, w, RGB565)
-            for y1 in range(h):
-                for x1 in range(w):
-                    fbuf2.pixel(y1, x1,
-                                fbuf.pixel((w - 1) - x1, y1))
-            self.block(x, y, x + (h - 1), y + w - 1, buf2)
+            self.block(x, y, x + (h - 1), y + w - 1, rotate270(buf, w, h))
 
     def draw_vline(self, x, y, h, color):
         """Draw a vertical line.
@@ -828,66 +1313,81 @@ class Display(object):
         for s in range(n):
             t = 2.0 * pi * s / sides + theta
             coords.append([int(r * cos(t) + x0), int(r * sin(t) + y0)])
-        # Starting point
-        x1, y1 = coords[0]
-        # Minimum Maximum X dict
-        xdict = {y1: [x1, x1]}
-        # Iterate through coordinates
-        for row in coords[1:]:
-            x2, y2 = row
-            xprev, yprev = x2, y2
-            # Calculate perimeter
-            # Check for horizontal side
-            if y1 == y2:
-                if x1 > x2:
-                    x1, x2 = x2, x1
-                if y1 in xdict:
-                    xdict[y1] = [min(x1, xdict[y1][0]), max(x2, xdict[y1][1])]
+        self.fill_polygon_coords(coords, color)
+
+    def fill_polygon_coords(self, coords, color):
+        """Draw a filled polygon from a list of vertices.
+
+        Args:
+            coords ([[int, int],...]): Vertex X, Y pairs.  The polygon is
+                closed automatically and may be concave.
+            color (int): RGB565 color value.
+        Note:
+            Uses an edge table and active edge list with the top-left fill
+            rule, so shared edges of adjacent polygons are not drawn twice.
+            Each horizontal span is a single block() from one row buffer.
+        """
+        n = len(coords)
+        if n > 1 and coords[0][0] == coords[-1][0] and \
+                coords[0][1] == coords[-1][1]:
+            n -= 1
+        if n < 3:
+            return
+        # Clip to the screen once up front
+        ys = [c[1] for c in coords[:n]]
+        ymin = max(min(ys), 0)
+        ymax = min(max(ys), self.height)
+        xs = [c[0] for c in coords[:n]]
+        if ymin >= ymax or max(xs) < 0 or min(xs) >= self.width:
+            return
+        # Edge table: [y top, y bottom, x at top (16.16), dx/dy (16.16)]
+        edges = []
+        xa, ya = coords[n - 1]
+        for i in range(n):
+            xb, yb = coords[i]
+            if ya != yb:
+                if ya < yb:
+                    edges.append([ya, yb, xa << 16,
+                                  ((xb - xa) << 16) // (yb - ya)])
                 else:
-                    xdict[y1] = [x1, x2]
-                x1, y1 = xprev, yprev
+                    edges.append([yb, ya, xb << 16,
+                                  ((xa - xb) << 16) // (ya - yb)])
+            xa, ya = xb, yb
+        edges.sort()
+        # Edges starting above the screen are advanced to the first row
+        for e in edges:
+            if e[0] < ymin:
+                e[2] += e[3] * (ymin - e[0])
+                e[0] = ymin
+        width = self.width
+        active = []
+        ei = 0
+        ne = len(edges)
+        for y in range(ymin, ymax):
+            # Drop finished edges and add new ones
+            active = [e for e in active if e[1] > y]
+            while ei < ne and edges[ei][0] == y:
+                if edges[ei][1] > y:
+                    active.append(edges[ei])
+                ei += 1
+            if not active:
                 continue
-            # Non horizontal side
-            # Changes in x, y
-            dx = x2 - x1
-            dy = y2 - y1
-            # Determine how steep the line is
-            is_steep = abs(dy) > abs(dx)
-            # Rotate line
-            if is_steep:
-                x1, y1 = y1, x1
-                x2, y2 = y2, x2
-            # Swap start and end points if necessary
-            if x1 > x2:
-                x1, x2 = x2, x1
-                y1, y2 = y2, y1
-            # Recalculate differentials
-            dx = x2 - x1
-            dy = y2 - y1
-            # Calculate error
-            error = dx >> 1
-            ystep = 1 if y1 < y2 else -1
-            y = y1
-            # Calcualte minimum and maximum x values
-            for x in range(x1, x2 + 1):
-                if is_steep:
-                    if x in xdict:
-                        xdict[x] = [min(y, xdict[x][0]), max(y, xdict[x][1])]
-                    else:
-                        xdict[x] = [y, y]
-                else:
-                    if y in xdict:
-                        xdict[y] = [min(x, xdict[y][0]), max(x, xdict[y][1])]
-                    else:
-                        xdict[y] = [x, x]
-                error -= abs(dy)
-                if error < 0:
-                    y += ystep
-                    error += dx
-            x1, y1 = xprev, yprev
-        # Fill polygon
-        for y, x in xdict.items():
-            self.draw_hline(x[0], y, x[1] - x[0] + 2, color)
+            # Insertion sort by x; order changes little between rows
+            for i in range(1, len(active)):
+                e = active[i]
+                j = i - 1
+                while j >= 0 and active[j][2] > e[2]:
+                    active[j + 1] = active[j]
+                    j -= 1
+                active[j + 1] = e
+            for i in range(0, len(active) - 1, 2):
+                x0 = max((active[i][2] + 0xFFFF) >> 16, 0)
+                x1 = min(((active[i + 1][2] + 0xFFFF) >> 16) - 1, width - 1)
+                if x0 <= x1:
+                    self.block(x0, y, x1, y,
+                               self._color_line(color, x1 - x0 + 1))
+            for e in active:
+                e[2] += e[3]
 
     def fill_vrect(self, x, y, w, h, color):
         """Draw a filled rectangle (optimized for vertical drawing).
@@ -1027,6 +1527,26 @@ class Display(object):
         else:
             self.write_cmd(self.SLPOUT)
 
+    def text_cache_off(self):
+        """Disable and release the glyph and label caches."""
+        self.glyph_cache = None
+        self.label_cache = None
+
+    def text_cache_on(self, glyph_bytes=4096, label_bytes=8192):
+        """Cache rendered glyphs (draw_letter/draw_text) and labels.
+
+        Args:
+            glyph_bytes (Optional int): Budget for glyph buffers
+                (default 4096).
+            label_bytes (Optional int): Budget for draw_label buffers
+                (default 8192, 0 disables the label cache).
+        Note:
+            Entries are keyed by font, text, colors and orientation, so a
+            label drawn in a new color is a new entry.
+        """
+        self.glyph_cache = GlyphCache(glyph_bytes) if glyph_bytes else None
+        self.label_cache = GlyphCache(label_bytes) if label_bytes else None
+
     def write_cmd_mpy(self, command, *args):
         """Write command to OLED (MicroPython).
 
@@ -1034,13 +1554,20 @@ class Display(object):
             command (byte): ILI9341 command code.
             *args (optional bytes): Data to transmit.
         """
+        self._cmd[0] = command
         self.dc(0)
         self.cs(0)
-        self.spi.write(bytearray([command]))
+        self.spi.write(self._cmd)
         self.cs(1)
         # Handle any passed data
-        if len(args) > 0:
+        n = len(args)
+        if n > len(self._args):
             self.write_data(bytearray(args))
+        elif n > 0:
+            buf = self._args
+            for i in range(n):
+                buf[i] = args[i]
+            self.write_data(self._args_views[n])
 
     def write_cmd_cpy(self, command, *args):
         """Write command to OLED (CircuitPython).
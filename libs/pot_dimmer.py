@@ -1,29 +1,149 @@
+from array import array
 from machine import ADC, Pin, PWM
 
+OVERSAMPLE = 4  # ADC reads averaged per update
+SMOOTHING = 2  # IIR filter shift: each update moves 1/2**SMOOTHING of the way
+HYSTERESIS = 2  # Output steps (0-255) a change must exceed to be reported
+SETTLE = 8  # Reads without further travel before the output holds again
+RGB_PINS = ((32, 15), (33, 2), (35, 17))  # (pot_pin, led_pin) for R, G, B
+
 
 class PotDimmer:
-    def __init__(self, pot_pin, led_pin, freq=1000):
+    def __init__(self, pot_pin, led_pin=None, freq=1000, oversample=OVERSAMPLE,
+                 smoothing=SMOOTHING, hysteresis=HYSTERESIS):
         # 1. Setup Potentiometer (ADC)
         self.adc = ADC(Pin(pot_pin))
         self.adc.atten(ADC.ATTN_11DB)  # Full range: 3.3v
         self.adc.width(ADC.WIDTH_12BIT)  # Range 0-4095
 
-        # 2. Setup LED (PWM)
-        self.led = PWM(Pin(led_pin), freq=freq)
-        self.led.duty(0)  # Start off
+        # 2. Setup LED (PWM), optional so the pins can be driven elsewhere
+        self.led = None
+        if led_pin is not None:
+            self.led = PWM(Pin(led_pin), freq=freq)
+            self.led.duty(0)  # Start off
+        self._duty = 0  # Last duty written to the PWM
 
         self.ADC_MAX = 4095
         self.PWM_MAX = 255
 
+        # 3. Filter state (integers only)
+        self.oversample = max(1, oversample)
+        self.smoothing = smoothing
+        self.hysteresis = hysteresis
+        self._acc = -1  # IIR accumulator, 16-bit ADC units << smoothing
+        self._value = 0  # Last reported 0-255 value
+        self._moving = 0  # Reads left before the output holds again
+        self._rising = False  # Direction of the last output change
+
+    def read(self):
+        """
+        Returns the oversampled, IIR-filtered and hysteresis-quantized
+        pot position (0-255) without touching the LED.
+        """
+        adc = self.adc
+        total = 0
+        for _ in range(self.oversample):
+            total += adc.read_u16()
+        raw = total // self.oversample
+
+        shift = self.smoothing
+        if self._acc < 0:
+            self._acc = raw << shift  # First read: start settled
+        else:
+            self._acc += raw - (self._acc >> shift)
+        value = (self._acc >> shift) >> 8  # 16-bit -> 0-255
+
+        # Only start moving on a change bigger than the hysteresis, then
+        # follow the filtered value exactly while it keeps travelling the
+        # same way, so the output does not stop short of where the pot
+        # ends up.  Readings within the band of either end snap to it so
+        # full off/on stay reachable; leaving an end takes another h steps
+        # so noise there can't flicker.
+        h = self.hysteresis
+        top = self.PWM_MAX
+        out = self._value
+        if value <= h or (out == 0 and value <= 2 * h):
+            value = 0
+        elif value >= top - h or (out == top and value >= top - 2 * h):
+            value = top
+        step = value - out
+        if step > h or -step > h or (step and value in (0, top)):
+            self._moving = SETTLE
+        elif self._moving:
+            if step and (step > 0) == self._rising:
+                self._moving = SETTLE  # Still travelling
+            else:
+                self._moving -= 1  # Standing still or jittering back
+        if self._moving:
+            if step:
+                self._rising = step > 0
+            self._value = value
+        return self._value
+
+    def apply(self, value):
+        """
+        Sets the LED brightness (0-255), writing the PWM only on change.
+        """
+        if value != self._duty and self.led is not None:
+            self.led.duty(value)
+            self._duty = value
+        return value
+
     def update(self):
         """
-        Reads the pot, updates the LED brightness, 
-        and returns the current raw value.
+        Reads the pot, updates the LED brightness,
+        and returns the current value (0-255).
         """
-        raw_val = self.adc.read()
+        return self.apply(self.read())
 
-        # Map 0-4095 (ADC) to 0-255 (PWM)
-        duty_cycle = (raw_val * self.PWM_MAX) // self.ADC_MAX
+    def deinit(self):
+        """
+        Turns the LED off and releases its PWM.
+        """
+        if self.led is not None:
+            self.led.duty(0)
+            self.led.deinit()
+            self.led = None
+
+
+class PotBank:
+    def __init__(self, pins=RGB_PINS, freq=1000, oversample=OVERSAMPLE,
+                 smoothing=SMOOTHING, hysteresis=HYSTERESIS):
+        """
+        A set of pot/LED pairs (R, G, B by default) sampled together
+        with the same filter settings. A led_pin of None samples the pot
+        only.
+        """
+        self.dimmers = tuple(
+            PotDimmer(pot_pin, led_pin, freq, oversample, smoothing,
+                      hysteresis)
+            for pot_pin, led_pin in pins)
+        self.value = array('H', [0] * len(self.dimmers))
+
+    def read(self):
+        """
+        Samples every pot in one pass without touching the LEDs.
+        Returns self.value, which is reused between calls.
+        """
+        value = self.value
+        i = 0
+        for dimmer in self.dimmers:
+            value[i] = dimmer.read()
+            i += 1
+        return value
+
+    def update(self):
+        """
+        Samples every pot, updates the matching LEDs and returns
+        self.value (0-255 per channel, reused between calls).
+        """
+        value = self.value
+        i = 0
+        for dimmer in self.dimmers:
+            value[i] = dimmer.apply(dimmer.read())
+            i += 1
+        return value
 
-        self.led.duty(duty_cycle)
-        return duty_cycle
\ No newline at end of file
+    def deinit(self):
+        for dimmer in self.dimmers:
+            dimmer.deinit()
@@ -0,0 +1,125 @@
+"""Bulk rotation of RGB565 pixel buffers.
+
+Pixels are moved as whole 16-bit units, so the byte order of each pixel
+is preserved.  On MicroPython builds with the viper emitter the copies run
+as native code; elsewhere (including CPython) a pure-Python fallback with
+identical results is used.
+"""
+
+try:
+    import micropython
+
+    @micropython.viper
+    def _rotate180(src: ptr16, dst: ptr16, n: int):
+        i = 0
+        j = n - 1
+        while i < n:
+            dst[j] = src[i]
+            i += 1
+            j -= 1
+
+    @micropython.viper
+    def _rotate90(src: ptr16, dst: ptr16, w: int, h: int):
+        x = 0
+        while x < w:
+            d = x * h
+            s = (h - 1) * w + x
+            y = 0
+            while y < h:
+                dst[d + y] = src[s]
+                s -= w
+                y += 1
+            x += 1
+
+    @micropython.viper
+    def _rotate270(src: ptr16, dst: ptr16, w: int, h: int):
+        x = 0
+        while x < w:
+            d = x * h
+            s = w - 1 - x
+            y = 0
+            while y < h:
+                dst[d + y] = src[s]
+                s += w
+                y += 1
+            x += 1
+
+    VIPER = True
+except (ImportError, AttributeError):
+    VIPER = False
+
+    def _rotate180(src, dst, n):
+        j = (n - 1) * 2
+        for i in range(0, n * 2, 2):
+            dst[j] = src[i]
+            dst[j + 1] = src[i + 1]
+            j -= 2
+
+    def _rotate90(src, dst, w, h):
+        d = 0
+        for x in range(w):
+            s = ((h - 1) * w + x) * 2
+            for _ in range(h):
+                dst[d] = src[s]
+                dst[d + 1] = src[s + 1]
+                d += 2
+                s -= w * 2
+
+    def _rotate270(src, dst, w, h):
+        d = 0
+        for x in range(w):
+            s = (w - 1 - x) * 2
+            for _ in range(h):
+                dst[d] = src[s]
+                dst[d + 1] = src[s + 1]
+                d += 2
+                s += w * 2
+
+
+def rotate180(src, dst=None):
+    """Rotate an RGB565 buffer by 180 degrees.
+
+    Args:
+        src (bytes): Source pixels.
+        dst (Optional bytearray): Destination, same size as src.
+    Returns:
+        bytearray: Rotated pixels (dst if given).
+    """
+    if dst is None:
+        dst = bytearray(len(src))
+    _rotate180(src, dst, len(src) // 2)
+    return dst
+
+
+def rotate90(src, w, h, dst=None):
+    """Rotate a w x h RGB565 buffer 90 degrees clockwise.
+
+    Args:
+        src (bytes): Source pixels, w x h row-major.
+        w (int): Source width.
+        h (int): Source height.
+        dst (Optional bytearray): Destination, same size as src.
+    Returns:
+        bytearray: h x w rotated pixels (dst if given).
+    """
+    if dst is None:
+        dst = bytearray(w * h * 2)
+    _rotate90(src, dst, w, h)
+    return dst
+
+
+def rotate270(src, w, h, dst=None):
+    """Rotate a w x h RGB565 buffer 270 degrees clockwise.
+
+    Args:
+        src (bytes): Source pixels, w x h row-major.
+        w (int): Source width.
+        h (int): Source height.
+        dst (Optional bytearray): Destination, same size as src.
+    Returns:
+        bytearray: h x w rotated pixels (dst if given).
+    """
+    if dst is None:
+        dst = bytearray(w * h * 2)
+    _rotate270(src, dst, w, h)
+    return dst
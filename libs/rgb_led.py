@@ -1,9 +1,35 @@
-from machine import Pin, PWM
+from machine import Pin, PWM, Timer
+from array import array
 import random
 
 MAX_8BIT = 255
 MAX_16BIT = 65_535
 PWM_FREQ = 1_000
+ANIM_FPS = 50  # Default animation frame rate
+GAMMA = 2.2  # Perceptual gamma for 8-bit input -> 16-bit duty
+
+_LUTS = {}
+
+
+def gamma_lut(gamma=GAMMA, invert=False):
+    """
+    Return the 256-entry 8-bit -> 16-bit duty table for a gamma.
+
+    Tables are built once and shared. gamma of None or 1 gives the
+    linear value * 257 mapping. invert folds in common-anode inversion.
+    """
+    key = (gamma, invert)
+    lut = _LUTS.get(key)
+    if lut is None:
+        lut = array('H', [0] * (MAX_8BIT + 1))
+        for i in range(MAX_8BIT + 1):
+            if gamma and gamma != 1:
+                duty = int(pow(i / MAX_8BIT, gamma) * MAX_16BIT + 0.5)
+            else:
+                duty = i * 257
+            lut[i] = MAX_16BIT - duty if invert else duty
+        _LUTS[key] = lut
+    return lut
 
 
 class RGBLED:
@@ -15,43 +41,188 @@ class RGBLED:
         invert: True for common-anode, False for common-cathode
     """
 
-    def __init__(self, pin_r: int, pin_g: int, pin_b: int, invert: bool = True):
+    def __init__(self, pin_r: int, pin_g: int, pin_b: int, invert: bool = True,
+                 gamma: float = GAMMA):
         """
         Initialize the RGB LED.
 
         Args:
             pin_r, pin_g, pin_b: GPIO pins connected to R, G, B
             invert: True if common-anode LED, False if common-cathode
+            gamma: Perceptual gamma applied to 0-255 values
+                   (None or 1 for linear duty)
         """
         self.invert = invert
         self.pwm_r = PWM(Pin(pin_r), freq=PWM_FREQ)
         self.pwm_g = PWM(Pin(pin_g), freq=PWM_FREQ)
         self.pwm_b = PWM(Pin(pin_b), freq=PWM_FREQ)
+        self._lut = gamma_lut(gamma, invert)
+        self._last = array('h', [-1, -1, -1])  # Last 8-bit value per channel
+
+        # Animation state: color in Q16 fixed point, per-frame step and a
+        # step table of [frames, step_r, step_g, step_b] per segment
+        self._pos = array('l', [0, 0, 0])
+        self._step = array('l', [0, 0, 0])
+        self._table = None
+        self._targets = None
+        self._segment = 0
+        self._frames_left = 0
+        self._timer = None
+        self._timer_cb = self._on_timer
 
     def _clamp(self, value):
-        return max(0, min(MAX_8BIT, value))
+        return max(0, min(MAX_8BIT, int(value)))
 
-    def _to_u16(self, value_8bit):
-        return value_8bit * 257
+    def invalidate(self):
+        """Forget the cached channel values so the next set_color writes all
+        three PWMs (e.g. after something else drove the pins)."""
+        last = self._last
+        last[0] = last[1] = last[2] = -1
 
     def set_color(self, r, g, b):
-        """Set the LED color."""
+        """Set the LED color, cancelling any running animation."""
+        if self._table is not None:
+            self.stop()
+        self._write(r, g, b)
+
+    def _write(self, r, g, b):
+        """Write the color; only channels that changed touch the PWM."""
         r = self._clamp(r)
         g = self._clamp(g)
         b = self._clamp(b)
+        lut = self._lut
+        last = self._last
+
+        if r != last[0]:
+            self.pwm_r.duty_u16(lut[r])
+            last[0] = r
+        if g != last[1]:
+            self.pwm_g.duty_u16(lut[g])
+            last[1] = g
+        if b != last[2]:
+            self.pwm_b.duty_u16(lut[b])
+            last[2] = b
+
+    def play(self, keyframes, fps: int = ANIM_FPS, timer_id=0):
+        """
+        Animate through a list of keyframes.
+
+        Args:
+            keyframes: Sequence of ((r, g, b), duration_ms). Each segment
+                       fades linearly from the previous color (0 ms jumps).
+                       An empty sequence only stops a running animation.
+            fps: Frames per second.
+            timer_id: machine.Timer to drive the animation, or None to
+                      call tick() yourself (e.g. from an asyncio task).
+
+        Interpolation steps are precomputed in Q16 fixed point, so each
+        frame costs three additions and at most three duty writes.
+        """
+        self.stop()
+        n = len(keyframes)
+        if not n:
+            return  # Nothing to play; the LED keeps its color
+        table = array('l', [0] * (4 * n))
+        targets = array('B', [0] * (3 * n))
+        last = self._last
+        prev = [max(0, last[0]), max(0, last[1]), max(0, last[2])]
+        for i in range(n):
+            color, duration_ms = keyframes[i]
+            frames = max(1, duration_ms * fps // 1000)
+            table[i * 4] = frames
+            for ch in range(3):
+                target = self._clamp(color[ch])
+                targets[i * 3 + ch] = target
+                table[i * 4 + 1 + ch] = ((target - prev[ch]) << 16) // frames
+                prev[ch] = target
+        pos = self._pos
+        for ch in range(3):
+            pos[ch] = max(0, last[ch]) << 16
+        self._table = table
+        self._targets = targets
+        self._load(0)
+        if timer_id is not None:
+            self._timer = Timer(timer_id)
+            self._timer.init(period=max(1, 1000 // fps), mode=Timer.PERIODIC,
+                             callback=self._timer_cb)
+
+    def fade_to(self, r, g, b, duration_ms: int, fps: int = ANIM_FPS,
+                timer_id=0):
+        """Fade from the current color to (r, g, b) in the background."""
+        self.play((((r, g, b), duration_ms),), fps, timer_id)
+
+    def flash(self, r, g, b, times: int = 3, on_ms: int = 200,
+              off_ms: int = 200, fps: int = ANIM_FPS, timer_id=0):
+        """Blink (r, g, b) on and off in the background, ending off."""
+        on = (r, g, b)
+        off = (0, 0, 0)
+        frames = []
+        for _ in range(times):
+            frames += [(on, 0), (on, on_ms), (off, 0), (off, off_ms)]
+        self.play(frames, fps, timer_id)
+
+    def _load(self, segment):
+        table = self._table
+        self._segment = segment
+        if segment * 4 >= len(table):
+            self._frames_left = 0
+            return
+        self._frames_left = table[segment * 4]
+        step = self._step
+        step[0] = table[segment * 4 + 1]
+        step[1] = table[segment * 4 + 2]
+        step[2] = table[segment * 4 + 3]
+
+    def tick(self):
+        """
+        Advance the animation by one frame.
+
+        Returns:
+            True while the animation is still running.
+        """
+        if self._table is None:
+            return False
+        pos = self._pos
+        step = self._step
+        pos[0] += step[0]
+        pos[1] += step[1]
+        pos[2] += step[2]
+        self._frames_left -= 1
+        if self._frames_left <= 0:
+            # Land exactly on the keyframe, then start the next segment
+            base = self._segment * 3
+            targets = self._targets
+            pos[0] = targets[base] << 16
+            pos[1] = targets[base + 1] << 16
+            pos[2] = targets[base + 2] << 16
+            self._load(self._segment + 1)
+        self._write((pos[0] + 0x8000) >> 16, (pos[1] + 0x8000) >> 16,
+                    (pos[2] + 0x8000) >> 16)
+        if not self._frames_left:
+            self.stop()
+            return False
+        return True
+
+    def _on_timer(self, timer):
+        self.tick()
 
-        dr = self._to_u16(r)
-        dg = self._to_u16(g)
-        db = self._to_u16(b)
+    def is_animating(self):
+        return self._table is not None
 
-        if self.invert:
-            dr = MAX_16BIT - dr
-            dg = MAX_16BIT - dg
-            db = MAX_16BIT - db
+    def stop(self):
+        """Stop any running animation, leaving the LED at its current color."""
+        self._table = None
+        if self._timer is not None:
+            self._timer.deinit()
+            self._timer = None
 
-        self.pwm_r.duty_u16(dr)
-        self.pwm_g.duty_u16(dg)
-        self.pwm_b.duty_u16(db)
+    def deinit(self):
+        """Stop animations, turn the LED off and release the PWM channels."""
+        self.stop()
+        self._write(0, 0, 0)
+        self.pwm_r.deinit()
+        self.pwm_g.deinit()
+        self.pwm_b.deinit()
 
     def generate_random_color(self, set_color=False):
         """Generate a random color and set it."""
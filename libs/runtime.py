@@ -0,0 +1,169 @@
+"""Cooperative runtime for the games.
+
+Input scanning, LED rendering, the status line and the game timer run at
+fixed rates on a TickScheduler task.  Game code is a coroutine that awaits
+button presses and sleeps instead of polling, so nothing it prints or
+waits on holds up the other tasks.  Runs on uasyncio on the board and on
+CPython asyncio on the host.
+"""
+from array import array
+from .scheduler import (TickScheduler, SKIP, asyncio, sleep_ms, ticks_ms,
+                        ticks_add, ticks_diff)
+from .ui import ui
+
+# Button indices, in Hardware order
+RESTART = 0  # LEFT
+LOCK = 1  # MIDDLE
+HINT = 2  # RIGHT
+
+INPUT_HZ = 200  # Pot and button scan rate
+LED_HZ = 60  # LED refresh rate
+STATUS_HZ = 4  # Status line refresh rate
+TIMER_HZ = 10  # Game timer resolution
+UI_HZ = 50  # Serial output drain rate
+UI_CHUNK = 192  # Bytes written per drain, ~9.6 kB/s (115200 baud is ~11.5)
+
+
+class Runtime:
+    """Background tasks and shared input state for one Hardware.
+
+    Attributes:
+        hw: The Hardware (or a fake with the same attributes).
+        mix: Latest pot reading (R, G, B), updated by the input task.
+        follow_mix: When True the LED task shows mix on the RGB LED.
+        status: Optional callable returning a status line (or None),
+            shown in place by the status task whenever it changes.
+        expired: True once a timer started with start_timer() runs out.
+        scheduler: The TickScheduler running the background tasks.
+    """
+
+    def __init__(self, hw):
+        self.hw = hw
+        self.buttons = (hw.restart_btn, hw.lock_btn, hw.hint_btn)
+        self.presses = array('H', [0] * len(self.buttons))
+        self.mix = array('H', [0, 0, 0])
+        self.follow_mix = False
+        self.status = None
+        self._status_text = None
+        self._deadline = None
+        self.expired = False
+        self._wake = None
+        self._task = None
+
+        sched = TickScheduler()
+        sched.add('input', self._scan_input, INPUT_HZ)
+        sched.add('led', self._render_led, LED_HZ)
+        sched.add('status', self._refresh_status, STATUS_HZ, policy=SKIP)
+        sched.add('timer', self._tick_timer, TIMER_HZ)
+        sched.add('ui', self._drain_ui, UI_HZ)
+        self.scheduler = sched
+
+    async def run(self, main):
+        """Run the background tasks for as long as the coroutine main."""
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self.scheduler.run())
+        try:
+            return await main
+        finally:
+            self._task.cancel()
+            self._task = None
+            ui.flush()
+
+    def report(self, title="Scheduler"):
+        """Print the scheduler's timing summary and start a new one."""
+        ui.flush()
+        self.scheduler.report(title)
+        self.scheduler.reset_stats()
+
+    # Background tasks
+
+    def _scan_input(self):
+        mix = self.mix
+        value = self.hw.pots.read()
+        mix[0] = value[0]
+        mix[1] = value[1]
+        mix[2] = value[2]
+        presses = self.presses
+        woke = False
+        for i in range(len(self.buttons)):
+            count = self.buttons[i].events()
+            if count:
+                presses[i] += count
+                woke = True
+        if woke:
+            self._wake.set()
+
+    def _render_led(self):
+        if self.follow_mix:
+            mix = self.mix
+            self.hw.rgb.set_color(mix[0], mix[1], mix[2])
+
+    def _refresh_status(self):
+        if self.status is None:
+            return
+        text = self.status()
+        if text is not None and text != self._status_text:
+            ui.status(text)
+            self._status_text = text
+
+    def _drain_ui(self):
+        ui.drain(UI_CHUNK)
+
+    def _tick_timer(self):
+        if self._deadline is None or self.expired:
+            return
+        if ticks_diff(self._deadline, ticks_ms()) <= 0:
+            self.expired = True
+            self._wake.set()
+
+    # Game API
+
+    def clear(self, *buttons):
+        """Forget presses not yet taken, of the given buttons or of all.
+
+        Call this when a new prompt is shown so presses made earlier
+        (e.g. while a result was on screen) do not answer it.
+        """
+        presses = self.presses
+        if not buttons:
+            self.hw.clear_buttons()
+            buttons = range(len(presses))
+        for i in buttons:
+            presses[i] = 0
+
+    def take(self, button):
+        """Consume one press of a button; True if there was one."""
+        if self.presses[button]:
+            self.presses[button] -= 1
+            return True
+        return False
+
+    async def wait(self, *buttons):
+        """Wait for a press of any of the buttons.
+
+        Returns:
+            The index of the button pressed (earlier arguments win ties),
+            or None if the game timer expired first.
+        """
+        while True:
+            for button in buttons:
+                if self.take(button):
+                    return button
+            if self.expired:
+                return None
+            self._wake.clear()
+            await self._wake.wait()
+
+    def start_timer(self, ms):
+        """Start (or restart) the game timer."""
+        self._deadline = ticks_add(ticks_ms(), ms)
+        self.expired = False
+
+    def stop_timer(self):
+        self._deadline = None
+        self.expired = False
+
+    def time_left_ms(self):
+        if self._deadline is None:
+            return 0
+        return max(0, ticks_diff(self._deadline, ticks_ms()))
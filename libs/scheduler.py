@@ -0,0 +1,171 @@
+"""Fixed-rate tick scheduler on top of (u)asyncio.
+
+Callbacks are registered with a rate in Hz and run from a single asyncio
+task on a fixed grid of deadlines, so their rates do not drift with how
+long game code, prints or other callbacks take.  Each task records its
+execution time, how often it went over its budget and how many ticks it
+missed, and report() prints a summary.
+
+Also home to the uasyncio / CPython compatibility shims used by the
+runtime.
+"""
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+try:
+    from time import ticks_ms, ticks_us, ticks_diff, ticks_add
+except ImportError:  # CPython
+    import time as _time
+
+    _TICKS_PERIOD = 1 << 30
+    _TICKS_HALF = _TICKS_PERIOD // 2
+
+    def ticks_ms():
+        return int(_time.monotonic() * 1000) & (_TICKS_PERIOD - 1)
+
+    def ticks_us():
+        return (_time.monotonic_ns() // 1000) & (_TICKS_PERIOD - 1)
+
+    def ticks_add(ticks, delta):
+        return (ticks + delta) & (_TICKS_PERIOD - 1)
+
+    def ticks_diff(a, b):
+        return ((a - b + _TICKS_HALF) & (_TICKS_PERIOD - 1)) - _TICKS_HALF
+
+if hasattr(asyncio, 'sleep_ms'):
+    sleep_ms = asyncio.sleep_ms
+else:
+    def sleep_ms(ms):
+        return asyncio.sleep(ms / 1000)
+
+# Overrun policies, used when a task falls one or more periods behind
+COALESCE = 0  # Run once now for all the missed ticks
+SKIP = 1  # Drop the late tick and wait for the next one on the grid
+
+
+class _Task:
+    def __init__(self, name, fn, rate_hz, budget_us, policy):
+        self.name = name
+        self.fn = fn
+        self.rate_hz = rate_hz
+        self.period = 1000000 // rate_hz  # us
+        self.budget = budget_us if budget_us is not None else self.period
+        self.policy = policy
+        self.deadline = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.runs = 0
+        self.total_us = 0
+        self.max_us = 0
+        self.over_budget = 0  # Runs that took longer than the budget
+        self.missed = 0  # Ticks that fell a whole period behind
+        self.skipped = 0  # Late ticks dropped under SKIP
+
+
+class TickScheduler:
+    """Run registered callbacks at fixed rates.
+
+    Example:
+        sched = TickScheduler()
+        sched.add('input', scan, 200)
+        sched.add('ui', refresh, 10, policy=SKIP)
+        asyncio.create_task(sched.run())
+    """
+
+    def __init__(self):
+        self.tasks = []
+
+    def add(self, name, fn, rate_hz, budget_us=None, policy=COALESCE):
+        """Register fn() to run rate_hz times a second.
+
+        Args:
+            name: Label used in report().
+            fn: Callable taking no arguments.  It should return quickly;
+                it runs inside the scheduler task.
+            rate_hz: Calls per second (at most 1000).
+            budget_us: Execution time above which a run counts as over
+                budget (default: one period).
+            policy: COALESCE or SKIP, applied when the task falls at least
+                one period behind.
+        """
+        if not 0 < rate_hz <= 1000:
+            raise ValueError("rate_hz must be 1-1000")
+        task = _Task(name, fn, rate_hz, budget_us, policy)
+        self.tasks.append(task)
+        return task
+
+    def _due(self, task, now):
+        """Advance the deadline; return True if the task should run now."""
+        period = task.period
+        late = ticks_diff(now, task.deadline)
+        missed = late // period
+        if not missed:
+            task.deadline = ticks_add(task.deadline, period)
+            return True
+        # Behind by whole periods: realign to the next grid point
+        task.missed += missed
+        task.deadline = ticks_add(task.deadline, (missed + 1) * period)
+        if task.policy == SKIP:
+            task.skipped += 1
+            return False
+        return True
+
+    def run_due(self):
+        """Run every task whose deadline has passed.
+
+        Returns:
+            Microseconds until the next deadline.
+        """
+        for task in self.tasks:
+            now = ticks_us()
+            if ticks_diff(now, task.deadline) < 0:
+                continue
+            if not self._due(task, now):
+                continue
+            task.fn()
+            elapsed = ticks_diff(ticks_us(), now)
+            task.runs += 1
+            task.total_us += elapsed
+            if elapsed > task.max_us:
+                task.max_us = elapsed
+            if elapsed > task.budget:
+                task.over_budget += 1
+
+        now = ticks_us()
+        wait = 1000000
+        for task in self.tasks:
+            left = ticks_diff(task.deadline, now)
+            if left < wait:
+                wait = left
+        return max(0, wait)
+
+    async def run(self):
+        """Scheduler loop; run it as an asyncio task and cancel to stop."""
+        start = ticks_us()
+        for task in self.tasks:
+            task.deadline = start
+        while True:
+            wait = self.run_due()
+            # Sleep in whole ms, rounding up: a task may run up to 1 ms
+            # late (the overrun policies absorb that) but the loop never
+            # spins on zero-length sleeps waiting out a sub-ms remainder
+            await sleep_ms((wait + 999) // 1000)
+
+    def reset_stats(self):
+        for task in self.tasks:
+            task.reset_stats()
+
+    def report(self, title="Scheduler"):
+        """Print per-task timing and overrun counts since the last reset."""
+        print("\n" + "-" * 50)
+        print(f"{title}: task timing")
+        print("TASK       HZ   RUNS  AVG us  MAX us >BUDGET MISSED SKIP")
+        for t in self.tasks:
+            avg = t.total_us // t.runs if t.runs else 0
+            print(f"{t.name:<8} {t.rate_hz:>4} {t.runs:>6} {avg:>7} "
+                  f"{t.max_us:>7} {t.over_budget:>7} {t.missed:>6} "
+                  f"{t.skipped:>4}")
+        print("-" * 50)
@@ -1,4 +1,4 @@
-from micropython import const
+from micropython import const, schedule
 import time
 import struct
 
@@ -6,16 +6,54 @@ import struct
 _COMMAND_BIT = const(0x80)
 _REGISTER_ENABLE = const(0x00)
 _REGISTER_ATIME = const(0x01)
+_REGISTER_AILT = const(0x04)
+_REGISTER_AIHT = const(0x06)
+_REGISTER_PERS = const(0x0C)
 _REGISTER_CONTROL = const(0x0F)
 _REGISTER_SENSORID = const(0x12)
 _REGISTER_STATUS = const(0x13)
 _REGISTER_CDATA = const(0x14)
 
+_COMMAND_AUTO_INC = const(0xA0)  # Command bit + auto-increment protocol
+_STATUS_AVALID = const(0x01)
+_CLEAR_INTERRUPT = b'\xe6'  # Special function: clear RGBC interrupt
+
+_ENABLE_AIEN = const(0x10)
 _ENABLE_AEN = const(0x02)
 _ENABLE_PON = const(0x01)
 
 _GAINS = (1, 4, 16, 60)
-_ATIMES = [2.4, 24, 50, 100, 200, 400, 614.4]  # in ms
+# Out-of-band cycles needed to assert INT, indexed by the PERS register
+_PERSISTENCE = (0, 1, 2, 3, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60)
+# Integration times in ms, as whole 2.4 ms cycles (1, 10, 20, ... 256)
+_ATIMES = [2.4, 24, 48, 98.4, 199.2, 398.4, 614.4]
+
+# Auto-exposure: re-expose only when the clear count leaves the hold band,
+# then aim for the middle of the (narrower) target band
+_AE_HOLD_LOW = 0.1
+_AE_HOLD_HIGH = 0.85
+_AE_TARGET_LOW = 0.25
+_AE_TARGET_HIGH = 0.75
+
+
+def _cycles(ms):
+    """Whole 2.4 ms integration cycles in ms (rounded down)."""
+    return int(ms * 10 + 0.5) // 24
+
+
+def full_scale(ms):
+    """Maximum count of a channel for an integration time in ms."""
+    return min(65535, 1024 * _cycles(ms))
+
+
+def normalize(data, exposure):
+    """Scale raw (r, g, b, c) to counts per ms per unit gain.
+
+    Values taken at different exposures become directly comparable.
+    """
+    gain, ms = exposure
+    k = 1 / (gain * ms)
+    return tuple(v * k for v in data)
 
 
 class TCS34725:
@@ -25,6 +63,22 @@ class TCS34725:
         self._active = False
         self._integration_time = 2.4
         self._gain = 1
+        # Continuous sampling state (see poll)
+        self._continuous = False
+        self._cycle_ms = 3
+        self._cycle_start = 0
+        self.sample = None
+        self.sample_ms = 0
+        self.exposure = (self._gain, self._integration_time)
+        # STATUS followed by CDATA..BDATA, read in one transaction
+        self._block = bytearray(9)
+        # Interrupt mode (see attach_irq)
+        self._irq_pin = None
+        self._irq_handler = None
+        self._service_ref = self._service  # Bound once, ISR must not allocate
+        self._events = []
+        self._event_limit = 8
+        self.events_dropped = 0
 
         # Check sensor ID
         sensor_id = self.sensor_id()
@@ -54,6 +108,8 @@ class TCS34725:
         if self._active == value:
             return
         self._active = value
+        if not value:
+            self._continuous = False
         enable = self._register8(_REGISTER_ENABLE)
         if value:
             self._register8(_REGISTER_ENABLE, enable | _ENABLE_PON)
@@ -68,12 +124,19 @@ class TCS34725:
         return self._register8(_REGISTER_SENSORID)
 
     def integration_time(self, ms=None):
+        """Get or set the integration time in ms.
+
+        The sensor integrates in whole 2.4 ms cycles, so ms is rounded
+        down to one (e.g. 50 gives 48.0) and the time actually used is
+        kept and returned.
+        """
         if ms is None:
             return self._integration_time
-        ms = min(614.4, max(2.4, ms))
-        self._integration_time = ms
-        cycles = int(ms / 2.4)
+        cycles = min(256, max(1, _cycles(ms)))
+        self._integration_time = cycles * 24 / 10
         self._register8(_REGISTER_ATIME, 256 - cycles)
+        self._cycle_ms = int(self._integration_time) + 1
+        self._restart_cycle()
         return self._integration_time
 
     def gain(self, value=None):
@@ -83,10 +146,198 @@ class TCS34725:
             raise ValueError("Gain must be 1,4,16,60")
         self._gain = value
         self._register8(_REGISTER_CONTROL, _GAINS.index(value))
+        self._restart_cycle()
         return self._gain
 
+    def _restart_cycle(self):
+        # The conversion in flight mixes old and new settings, so the
+        # first clean sample is two cycles away
+        if self._continuous:
+            self._cycle_start = time.ticks_add(time.ticks_ms(), self._cycle_ms)
+
+    def continuous(self, value=None):
+        """Get or set continuous sampling.
+
+        While on, the sensor stays powered and converts back to back, and
+        poll() returns new samples without blocking.
+        """
+        if value is None:
+            return self._continuous
+        value = bool(value)
+        if value and not self._continuous:
+            self.active(True)
+            self._continuous = True
+            self.sample = None
+            self._restart_cycle()
+        elif not value:
+            self._continuous = False
+
+    def poll(self):
+        """Return a new (r, g, b, c) sample, or None if none is ready yet.
+
+        The first call only starts continuous sampling and returns None;
+        if the sensor was off this waits out its ~3 ms power-on once (see
+        active).  After that poll never sleeps, and no I2C traffic happens
+        until an integration cycle has had time to finish.  The time of
+        the sample is kept in sample_ms (see age_ms).
+        """
+        if not self._continuous:
+            self.continuous(True)
+            return None
+        now = time.ticks_ms()
+        elapsed = time.ticks_diff(now, self._cycle_start)
+        if elapsed < self._cycle_ms:
+            return None
+        if not self._read_block():
+            return None
+        # Stay phase-locked to the sensor's conversion cycle
+        done = time.ticks_add(self._cycle_start,
+                              (elapsed // self._cycle_ms) * self._cycle_ms)
+        self._cycle_start = done
+        self.sample_ms = done
+        self.exposure = (self._gain, self._integration_time)
+        self.sample = self._decode()
+        return self.sample
+
+    def age_ms(self):
+        """Milliseconds since the last polled sample finished, or None."""
+        if self.sample is None:
+            return None
+        return time.ticks_diff(time.ticks_ms(), self.sample_ms)
+
+    def interrupt_thresholds(self, low=None, high=None):
+        """Get or set the clear channel interrupt band (AILT/AIHT).
+
+        INT asserts when the clear count goes below low or above high.
+        """
+        if low is None and high is None:
+            return (self._register16(_REGISTER_AILT),
+                    self._register16(_REGISTER_AIHT))
+        if low is not None:
+            self._register16(_REGISTER_AILT, max(0, min(65535, low)))
+        if high is not None:
+            self._register16(_REGISTER_AIHT, max(0, min(65535, high)))
+
+    def persistence(self, cycles=None):
+        """Get or set how many out-of-band cycles trigger the interrupt.
+
+        Rounded up to the next value the sensor supports (0-3, 5, 10, ...,
+        60).  0 interrupts on every cycle.
+        """
+        if cycles is None:
+            return _PERSISTENCE[self._register8(_REGISTER_PERS) & 0x0F]
+        for index, value in enumerate(_PERSISTENCE):
+            if value >= cycles:
+                break
+        self._register8(_REGISTER_PERS, index)
+        return _PERSISTENCE[index]
+
+    def interrupt(self, value=None):
+        """Get or set the clear channel interrupt enable (AIEN)."""
+        enable = self._register8(_REGISTER_ENABLE)
+        if value is None:
+            return bool(enable & _ENABLE_AIEN)
+        if value:
+            enable |= _ENABLE_AIEN
+        else:
+            enable &= ~_ENABLE_AIEN
+        self._register8(_REGISTER_ENABLE, enable)
+
+    def clear_interrupt(self):
+        self.i2c.writeto(self.address, _CLEAR_INTERRUPT)
+
+    def attach_irq(self, pin, low, high, handler=None, persistence=2,
+                   queue_size=8):
+        """Watch the INT line and queue an event when the band is left.
+
+        Args:
+            pin: machine.Pin connected to INT (open drain, active low),
+                configured as an input with pull-up.
+            low, high: Clear channel band; INT asserts outside it.
+            handler: Optional callable(event), run from the scheduler.
+            persistence: Consecutive out-of-band cycles needed to assert
+                INT (at least 1; 0 would interrupt on every cycle).
+            queue_size: Events kept before the oldest are dropped.
+
+        Events are (ticks_ms, r, g, b, c) of the sample that tripped the
+        threshold.  The sensor is put in continuous mode and no I2C traffic
+        happens while the clear channel stays inside the band.
+        """
+        self._irq_handler = handler
+        self._event_limit = queue_size
+        self._events = []
+        self.interrupt_thresholds(low, high)
+        self.persistence(max(1, persistence))
+        self.continuous(True)
+        self.clear_interrupt()
+        self.interrupt(True)
+        self._irq_pin = pin
+        pin.irq(trigger=pin.IRQ_FALLING, handler=self._irq, hard=True)
+
+    def detach_irq(self):
+        if self._irq_pin is not None:
+            self._irq_pin.irq(handler=None)
+            self._irq_pin = None
+        self.interrupt(False)
+
+    def _irq(self, pin):
+        # Hard IRQ context: no I2C, no allocation; defer to the scheduler
+        try:
+            schedule(self._service_ref, None)
+        except RuntimeError:
+            self.events_dropped += 1  # Schedule queue full
+
+    def _service(self, _):
+        if self._irq_pin is None:
+            return  # Detached while the callback was queued
+        self._read_block()
+        self.clear_interrupt()
+        r, g, b, c = self._decode()
+        event = (time.ticks_ms(), r, g, b, c)
+        if len(self._events) >= self._event_limit:
+            self._events.pop(0)
+            self.events_dropped += 1
+        self._events.append(event)
+        if self._irq_handler is not None:
+            self._irq_handler(event)
+
+    def events(self):
+        """Return and clear the queued interrupt events (oldest first)."""
+        events = self._events
+        self._events = []
+        return events
+
     def _valid(self):
-        return bool(self._register8(_REGISTER_STATUS) & 0x01)
+        return bool(self._register8(_REGISTER_STATUS) & _STATUS_AVALID)
+
+    def _read_block(self):
+        """Burst-read STATUS..BDATA into the preallocated block buffer.
+
+        Returns True if the data is valid (AVALID set).
+        """
+        self.i2c.readfrom_mem_into(self.address,
+                                   _COMMAND_AUTO_INC | _REGISTER_STATUS,
+                                   self._block)
+        return bool(self._block[0] & _STATUS_AVALID)
+
+    def _decode(self):
+        buf = self._block
+        return (buf[3] | buf[4] << 8, buf[5] | buf[6] << 8,
+                buf[7] | buf[8] << 8, buf[1] | buf[2] << 8)
+
+    def read_into(self, out):
+        """Burst-read into out[0:4] as R,G,B,C without allocating.
+
+        Never waits.  Returns True if the sensor had valid data.
+        """
+        if not self._read_block():
+            return False
+        buf = self._block
+        out[0] = buf[3] | buf[4] << 8
+        out[1] = buf[5] | buf[6] << 8
+        out[2] = buf[7] | buf[8] << 8
+        out[3] = buf[1] | buf[2] << 8
+        return True
 
     def read_raw(self):
         """Return raw R,G,B,C values"""
@@ -95,36 +346,98 @@ class TCS34725:
             self.active(True)
             time.sleep_ms(int(self._integration_time + 2))
 
-        while not self._valid():
+        # Status and data arrive together, so the last poll is the read
+        while not self._read_block():
             time.sleep_ms(1)
-
-        data = self.i2c.readfrom_mem(self.address, 0xA0 | _REGISTER_CDATA, 8)
-        c, r, g, b = struct.unpack('<HHHH', data)
+        r, g, b, c = self._decode()
+        self.exposure = (self._gain, self._integration_time)
 
         if not was_active:
             self.active(False)
         return r, g, b, c
 
+    def read_normalized(self, auto_adjust=True):
+        """Return R,G,B,C in counts per ms per unit gain (see normalize)"""
+        data = self._read_exposed(auto_adjust)
+        return normalize(data, self.exposure)
+
+    def auto_exposure(self, c):
+        """Pick the gain/integration time for a clear count in one step.
+
+        The current exposure is kept while c is inside the hold band.
+        Otherwise the light level (counts per ms per gain) is estimated
+        from c.  A gain change at the current integration time is tried
+        first, so resolution is not traded away when gain alone fixes it;
+        after that the shortest integration time that lands it in the
+        target band is chosen, with the gain closest to the band centre.
+        If nothing lands in the band, the closest candidate is used only
+        when it is closer than the current exposure.
+
+        Returns:
+            bool: True if the exposure was changed.
+        """
+        gain, ms = self._gain, self._integration_time
+        full = full_scale(ms)
+        if _AE_HOLD_LOW * full <= c <= _AE_HOLD_HIGH * full:
+            return False
+        if c >= full:
+            # Saturated: the true level is at least this, assume 4x more
+            rate = 4 * full / (gain * ms)
+        else:
+            rate = max(c, 1) / (gain * ms)
+        centre = (_AE_TARGET_LOW + _AE_TARGET_HIGH) / 2
+        half_band = (_AE_TARGET_HIGH - _AE_TARGET_LOW) / 2
+        closest = None
+        best = None
+        for t in [ms] + _ATIMES:
+            fs = full_scale(t)
+            for g in _GAINS:
+                error = abs(rate * g * t / fs - centre)
+                if closest is None or error < closest[0]:
+                    closest = (error, g, t)
+                if error <= half_band and (best is None or error < best[0]):
+                    best = (error, g, t)
+            if best is not None:
+                break
+        else:
+            # Too dark or too bright for any exposure.  Step towards the
+            # band only if that beats the current setting, otherwise hold
+            # it rather than trade resolution for nothing
+            if closest[0] >= abs(rate * gain * ms / full - centre):
+                return False
+            best = closest
+        _, g, t = best
+        if (g, t) == (gain, ms):
+            return False
+        if g != gain:
+            self.gain(g)
+        if t != ms:
+            self.integration_time(t)
+        return True
+
+    def _read_exposed(self, auto_adjust):
+        data = self.read_raw()
+        old_ms = self.exposure[1]
+        if auto_adjust and self.auto_exposure(data[3]):
+            if data[3] >= full_scale(old_ms):
+                # A saturated reading is useless; take one at the new
+                # exposure straight away.  A running sensor still holds
+                # the old sample (AVALID stays set), so wait out the
+                # cycle in flight and one full cycle at the new settings
+                if self._active:
+                    time.sleep_ms(int(old_ms) + 1 + self._cycle_ms)
+                data = self.read_raw()
+        return data
+
     def read(self, auto_adjust=True):
-        """Return processed data: CCT and Lux if valid, else None, Lux"""
-        r, g, b, c = self.read_raw()
-
-        if auto_adjust:
-            # Adjust gain/integration if saturated
-            if c > 0.9 * 65535:
-                if self._gain > 1:
-                    self.gain(self._gain // 4)
-                elif self._integration_time > 2.4:
-                    self.integration_time(max(2.4, self._integration_time / 2))
-            elif c < 1000:
-                if self._gain < 60:
-                    self.gain(min(60, self._gain * 4))
-                elif self._integration_time < 614.4:
-                    self.integration_time(
-                        min(614.4, self._integration_time * 2))
+        """Return processed data: CCT and Lux if valid, else None, Lux
+
+        The exposure the data was taken at is left in self.exposure.
+        """
+        r, g, b, c = self._read_exposed(auto_adjust)
 
         # CCT/Lux calculation only if valid (C not zero and not saturated)
-        if c == 0 or c > 65535:
+        if c == 0 or c >= full_scale(self.exposure[1]):
             return None, None
         # DN40 formula
         x = -0.14282*r + 1.54924*g + -0.95641*b
@@ -138,14 +451,42 @@ class TCS34725:
         return cct, y
 
 
+# pow(x, 2.5) * 255 for x = i / 1024, so html_rgb needs no floats
+_GAMMA_BITS = const(10)
+_GAMMA_LUT = bytes(min(255, int(pow(i / (1 << _GAMMA_BITS), 2.5) * 255))
+                   for i in range((1 << _GAMMA_BITS) + 1))
+
+
 def html_rgb(data):
     r, g, b, c = data
     if c == 0:
         return 0, 0, 0
-    red = int(pow((r/c), 2.5) * 255)
-    green = int(pow((g/c), 2.5) * 255)
-    blue = int(pow((b/c), 2.5) * 255)
-    return red, green, blue
+    lut = _GAMMA_LUT
+    top = 1 << _GAMMA_BITS
+    return (lut[min(top, (r << _GAMMA_BITS) // c)],
+            lut[min(top, (g << _GAMMA_BITS) // c)],
+            lut[min(top, (b << _GAMMA_BITS) // c)])
+
+
+def html_rgb_batch(samples, out):
+    """Convert packed R,G,B,C samples to packed 8-bit R,G,B in out.
+
+    samples is a flat sequence (e.g. array('H')) of 4 values per sample
+    and out a bytearray with room for 3 bytes per sample.  Integer only.
+    """
+    lut = _GAMMA_LUT
+    top = 1 << _GAMMA_BITS
+    j = 0
+    for i in range(0, len(samples) - 3, 4):
+        c = samples[i + 3]
+        if c == 0:
+            out[j] = out[j + 1] = out[j + 2] = 0
+        else:
+            out[j] = lut[min(top, (samples[i] << _GAMMA_BITS) // c)]
+            out[j + 1] = lut[min(top, (samples[i + 1] << _GAMMA_BITS) // c)]
+            out[j + 2] = lut[min(top, (samples[i + 2] << _GAMMA_BITS) // c)]
+        j += 3
+    return out
 
 
 def html_hex(data):
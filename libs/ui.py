@@ -0,0 +1,229 @@
+"""Buffered serial output for the game dashboards.
+
+print() encodes each piece of text straight into a preallocated frame
+buffer (no joined line or concatenated copy is built) and frames are
+queued whole in a byte ring; nothing touches the UART until drain() or
+flush() runs.  The only per-line allocations left are the caller's own
+strings and one encode() temporary per piece: MicroPython has no way to
+encode a str into an existing buffer.
+With the runtime, a scheduler task calls drain() with a byte budget per
+tick, so a long dashboard goes out in small writes between frames of
+game logic instead of blocking it for the whole transfer.
+
+Everything the games print goes through the module-level `ui` writer so
+output stays in order.  A frame begun with a key is a dashboard that a
+newer one replaces: in latest_wins mode it is dropped if it has not
+started to go out when the next frame with that key is queued.  Other
+frames (prompts, results, banners) are never dropped; a full queue is
+flushed instead.  The status line always keeps only its latest value and
+is shown when the queue is empty.
+"""
+import sys
+from array import array
+
+CAPACITY = 4096  # Bytes of queued output
+MAX_FRAMES = 64  # Frames queued at once
+
+
+def _copy(mv, pos, text):
+    """Encode text into mv at pos, cut to fit.
+
+    Returns the position after the whole text, past len(mv) if it was cut.
+    """
+    data = text.encode()
+    n = len(data)
+    room = len(mv) - pos
+    if n <= room:
+        mv[pos:pos + n] = data
+    elif room > 0:
+        mv[pos:] = memoryview(data)[:room]
+    return pos + n
+
+
+class UIWriter:
+    """Frame-buffered writer for a stream (sys.stdout by default)."""
+
+    def __init__(self, stream=None, capacity=CAPACITY, max_frames=MAX_FRAMES,
+                 latest_wins=False):
+        if stream is None:
+            # Write bytes straight to the port, skipping the text layer
+            stream = getattr(sys.stdout, 'buffer', sys.stdout)
+        self.stream = stream
+        self._flush = getattr(stream, 'flush', None)
+        self.latest_wins = latest_wins
+        self.capacity = capacity
+
+        # Frame being built
+        self._build = bytearray(capacity)
+        self._build_mv = memoryview(self._build)
+        self._bpos = 0
+        self._building = False
+        self._key = 0
+
+        # Queue: byte ring plus a ring of frame lengths
+        self._ring = bytearray(capacity)
+        self._ring_mv = memoryview(self._ring)
+        self._head = 0  # Next byte to send
+        self._len = 0  # Bytes queued
+        self._frames = array('H', [0] * max_frames)
+        self._keys = bytearray(max_frames)  # Frame keys, 0 for none
+        self._fhead = 0
+        self._fcount = 0
+        self._sent = 0  # Bytes of the head frame already sent
+
+        # Latest-only status line
+        self._status = bytearray(128)
+        self._status_len = 0
+
+        self.frames = 0  # Frames queued
+        self.dropped = 0  # Frames replaced before they went out
+        self.truncated = 0  # Frames cut to capacity
+
+    # Building frames
+
+    def begin(self, key=0):
+        """Start a frame; print() appends to it until end().
+
+        Args:
+            key: 1-255 for a dashboard that newer frames with the same
+                key replace (latest_wins mode), 0 for a frame that must
+                always go out.
+        """
+        self._building = True
+        self._bpos = 0
+        self._key = key
+
+    def end(self):
+        """Queue the frame built since begin()."""
+        self._building = False
+        self._enqueue(self._build_mv, self._bpos, self._key)
+
+    def print(self, *args, sep=' ', end='\n'):
+        """Like print().  Outside begin()/end() each call is its own frame."""
+        if not self._building:
+            self._bpos = 0
+        mv = self._build_mv
+        pos = self._bpos
+        first = True
+        for a in args:
+            if not first:
+                pos = _copy(mv, pos, sep)
+            first = False
+            pos = _copy(mv, pos, a if isinstance(a, str) else str(a))
+        pos = _copy(mv, pos, end)
+        if pos > self.capacity:
+            self.truncated += 1
+            pos = self.capacity
+        self._bpos = pos
+        if not self._building:
+            self._enqueue(mv, pos)
+
+    def status(self, text, end='\r'):
+        """Set the status line.  Only the newest value is ever written."""
+        mv = memoryview(self._status)
+        pos = _copy(mv, _copy(mv, 0, text), end)
+        self._status_len = min(pos, len(self._status))
+
+    # Queue
+
+    def _enqueue(self, data, n, key=0):
+        cap = self.capacity
+        if n > cap:
+            self.truncated += 1
+            n = cap
+        frames = self._frames
+        if key and self.latest_wins:
+            self._replace(key)
+        while cap - self._len < n or self._fcount == len(frames):
+            self.flush()
+
+        ring = self._ring
+        tail = (self._head + self._len) % cap
+        first = min(n, cap - tail)
+        ring[tail:tail + first] = data[:first]
+        if first < n:
+            ring[:n - first] = data[first:n]
+        self._len += n
+        slot = (self._fhead + self._fcount) % len(frames)
+        frames[slot] = n
+        self._keys[slot] = key
+        self._fcount += 1
+        self.frames += 1
+
+    def _replace(self, key):
+        # Drop queued frames with this key, except one already going out
+        frames = self._frames
+        keys = self._keys
+        nf = len(frames)
+        i = 0
+        offset = -self._sent  # Bytes from _head to frame i
+        while i < self._fcount:
+            slot = (self._fhead + i) % nf
+            size = frames[slot]
+            if keys[slot] != key or (i == 0 and self._sent):
+                offset += size
+                i += 1
+                continue
+            self._cut(offset, size)
+            for j in range(i, self._fcount - 1):
+                dst = (self._fhead + j) % nf
+                src = (dst + 1) % nf
+                frames[dst] = frames[src]
+                keys[dst] = keys[src]
+            self._fcount -= 1
+            self.dropped += 1
+
+    def _cut(self, offset, size):
+        # Close a gap of size bytes at offset from _head by moving the
+        # bytes after it down, in pieces that neither wrap nor overlap
+        cap = self.capacity
+        mv = self._ring_mv
+        dst = offset
+        count = self._len - offset - size
+        while count:
+            s = (self._head + dst + size) % cap
+            d = (self._head + dst) % cap
+            n = min(count, size, cap - s, cap - d)
+            mv[d:d + n] = mv[s:s + n]
+            dst += n
+            count -= n
+        self._len -= size
+
+    def pending(self):
+        """Bytes waiting to be written (including the status line)."""
+        return self._len + self._status_len
+
+    def drain(self, budget=None):
+        """Write up to budget bytes (all if None) of queued output.
+
+        Returns:
+            Bytes still pending.
+        """
+        cap = self.capacity
+        frames = self._frames
+        while self._len and (budget is None or budget > 0):
+            n = min(self._len, cap - self._head)
+            if budget is not None:
+                n = min(n, budget)
+                budget -= n
+            self.stream.write(self._ring_mv[self._head:self._head + n])
+            self._head = (self._head + n) % cap
+            self._len -= n
+            self._sent += n
+            while self._fcount and self._sent >= frames[self._fhead]:
+                self._sent -= frames[self._fhead]
+                self._fhead = (self._fhead + 1) % len(frames)
+                self._fcount -= 1
+        if not self._len and self._status_len and (budget is None or budget > 0):
+            self.stream.write(memoryview(self._status)[:self._status_len])
+            self._status_len = 0
+        if self._flush is not None:
+            self._flush()
+        return self.pending()
+
+    def flush(self):
+        """Write everything queued now (blocking)."""
+        self.drain()
+
+
+ui = UIWriter(latest_wins=True)
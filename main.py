@@ -1,72 +1,85 @@
 from games import game1, game2, game3
-from libs import button
-from time import sleep_ms
+from libs.hardware import Hardware
+from libs.runtime import Runtime, asyncio, sleep_ms, RESTART
+from libs.ui import ui
 
-restart_btn = button.Button(12, debounce_ms=100)  # LEFT → Restart
 
-while True:
-    print("\n\n")
-    print("=" * 50)
-    print("COLOR MIXING CHAMPIONSHIP".center(50))
-    print("=" * 50)
-    print("Two players will compete in three games:")
-    print("  • Game 1: Spectral Light Mixer (2 rounds)")
-    print("  • Game 2: Color Scavenger Hunt (5 rounds)")
-    print("  • Game 3: Time Attack Mode (2 minutes)")
-    print("\nHighest combined score wins!")
-    print("=" * 50)
-    sleep_ms(2000)
+async def play(rt, game, player_num):
+    """Run one game and print the scheduler timing for it."""
+    rt.scheduler.reset_stats()
+    score = await game.start_game(rt, player_num=player_num)
+    rt.report(f"{game.__name__} - player {player_num}")
+    return score
+
+
+async def championship(rt):
+    while True:
+        ui.print("\n\n")
+        ui.print("=" * 50)
+        ui.print("COLOR MIXING CHAMPIONSHIP".center(50))
+        ui.print("=" * 50)
+        ui.print("Two players will compete in three games:")
+        ui.print("  • Game 1: Spectral Light Mixer (2 rounds)")
+        ui.print("  • Game 2: Color Scavenger Hunt (5 rounds)")
+        ui.print("  • Game 3: Time Attack Mode (2 minutes)")
+        ui.print("\nHighest combined score wins!")
+        ui.print("=" * 50)
+        await sleep_ms(2000)
     
-    totals = [0, 0]
+        totals = [0, 0]
 
-    # Player 1
-    print("\n\n" + "=" * 50)
-    print("PLAYER 1'S TURN".center(50))
-    print("=" * 50)
-    sleep_ms(1500)
-    totals[0] += game1.start_game(player_num=1)
-    totals[0] += game2.start_game(player_num=1)
-    totals[0] += game3.start_game(player_num=1)
-    print("\n" + "=" * 50)
-    print(f"PLAYER 1 FINAL SCORE: {totals[0]} points".center(50))
-    print("=" * 50)
-    sleep_ms(2000)
+        # Player 1
+        ui.print("\n\n" + "=" * 50)
+        ui.print("PLAYER 1'S TURN".center(50))
+        ui.print("=" * 50)
+        await sleep_ms(1500)
+        totals[0] += await play(rt, game1, 1)
+        totals[0] += await play(rt, game2, 1)
+        totals[0] += await play(rt, game3, 1)
+        ui.print("\n" + "=" * 50)
+        ui.print(f"PLAYER 1 FINAL SCORE: {totals[0]} points".center(50))
+        ui.print("=" * 50)
+        await sleep_ms(2000)
 
-    # Player 2
-    print("\n\n" + "=" * 50)
-    print("PLAYER 2'S TURN".center(50))
-    print("=" * 50)
-    sleep_ms(1500)
-    totals[1] += game1.start_game(player_num=2)
-    totals[1] += game2.start_game(player_num=2)
-    totals[1] += game3.start_game(player_num=2)
-    print("\n" + "=" * 50)
-    print(f"PLAYER 2 FINAL SCORE: {totals[1]} points".center(50))
-    print("=" * 50)
-    sleep_ms(2000)
+        # Player 2
+        ui.print("\n\n" + "=" * 50)
+        ui.print("PLAYER 2'S TURN".center(50))
+        ui.print("=" * 50)
+        await sleep_ms(1500)
+        totals[1] += await play(rt, game1, 2)
+        totals[1] += await play(rt, game2, 2)
+        totals[1] += await play(rt, game3, 2)
+        ui.print("\n" + "=" * 50)
+        ui.print(f"PLAYER 2 FINAL SCORE: {totals[1]} points".center(50))
+        ui.print("=" * 50)
+        await sleep_ms(2000)
 
-    # Final Results
-    print("\n\n")
-    print("=" * 50)
-    print("FINAL RESULTS".center(50))
-    print("=" * 50)
-    print(f"Player 1: {totals[0]} points")
-    print(f"Player 2: {totals[1]} points")
-    print("=" * 50)
-    
-    if totals[0] > totals[1]:
-        print("\n🏆 PLAYER 1 WINS! 🏆".center(50))
-    elif totals[1] > totals[0]:
-        print("\n🏆 PLAYER 2 WINS! 🏆".center(50))
-    else:
-        print("\n🤝 IT'S A TIE! 🤝".center(50))
+        # Final Results
+        ui.print("\n\n")
+        ui.print("=" * 50)
+        ui.print("FINAL RESULTS".center(50))
+        ui.print("=" * 50)
+        ui.print(f"Player 1: {totals[0]} points")
+        ui.print(f"Player 2: {totals[1]} points")
+        ui.print("=" * 50)
     
-    print("=" * 50)
-    print("\n[Press LEFT button to play again]")
+        if totals[0] > totals[1]:
+            ui.print("\n🏆 PLAYER 1 WINS! 🏆".center(50))
+        elif totals[1] > totals[0]:
+            ui.print("\n🏆 PLAYER 2 WINS! 🏆".center(50))
+        else:
+            ui.print("\n🤝 IT'S A TIE! 🤝".center(50))
     
-    while True:
-        if restart_btn.was_pressed():
-            print("\n🔄 Restarting championship...\n")
-            sleep_ms(1000)
-            break
-        sleep_ms(50)
+        ui.print("=" * 50)
+        ui.print("\n[Press LEFT button to play again]")
+        rt.clear()
+        await rt.wait(RESTART)
+        ui.print("\n🔄 Restarting championship...\n")
+        await sleep_ms(1000)
+
+
+# Every pin, PWM and ADC is set up once for all games, and released on the
+# way out (e.g. Ctrl-C) so a re-run from the REPL finds no IRQs still armed
+with Hardware() as hw:
+    rt = Runtime(hw)
+    asyncio.run(rt.run(championship(rt)))
@@ -0,0 +1,32 @@
+"""Put the host fakes and the repo root on sys.path for every test."""
+import os
+import sys
+import time
+
+import pytest
+
+HERE = os.path.dirname(__file__)
+sys.path[:0] = [os.path.join(HERE, 'fakes'), os.path.dirname(HERE)]
+
+
+class Clock:
+    """Manual millisecond clock behind time.ticks_ms and friends."""
+
+    def __init__(self):
+        self.now = 0
+
+    def ticks_ms(self):
+        return self.now
+
+    def sleep_ms(self, ms):
+        self.now += ms
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(time, 'ticks_ms', c.ticks_ms, raising=False)
+    monkeypatch.setattr(time, 'ticks_diff', lambda a, b: a - b, raising=False)
+    monkeypatch.setattr(time, 'ticks_add', lambda a, b: a + b, raising=False)
+    monkeypatch.setattr(time, 'sleep_ms', c.sleep_ms, raising=False)
+    return c
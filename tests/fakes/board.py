@@ -0,0 +1,29 @@
+"""Host stand-in for the board: the real Hardware over the machine fakes.
+
+Buttons are pressed by driving their pins, so presses go through the
+same IRQ debounce as on the board, and the pots read whatever level the
+test sets.
+"""
+from libs import runtime
+from libs.hardware import Hardware
+
+
+class FakeHardware(Hardware):
+    def __init__(self, debounce_ms=50):
+        super().__init__(debounce_ms=debounce_ms)
+        self.debounce_ms = debounce_ms
+        self.set_mix(0, 0, 0)
+
+    def set_mix(self, r, g, b):
+        """Turn the pots to (r, g, b), 0-255 each."""
+        for dimmer, level in zip(self.pots.dimmers, (r, g, b)):
+            dimmer.adc.source = lambda level=level: level * 257
+
+    async def press(self, button, hold_ms=60):
+        """Press and release a button, then leave it quiet long enough
+        for the next press to count."""
+        pin = button.pin
+        pin.drive(0)
+        await runtime.sleep_ms(hold_ms)
+        pin.drive(1)
+        await runtime.sleep_ms(2 * self.debounce_ms)
@@ -0,0 +1,27 @@
+"""Host stand-in for framebuf (RGB565 only; text draws a bit pattern)."""
+RGB565 = 1
+
+
+class FrameBuffer:
+    def __init__(self, buf, w, h, fmt):
+        self.buf = buf
+        self.w = w
+        self.h = h
+
+    def pixel(self, x, y, c=None):
+        i = (y * self.w + x) * 2
+        if c is None:
+            return self.buf[i] | self.buf[i + 1] << 8
+        self.buf[i] = c & 0xff
+        self.buf[i + 1] = c >> 8
+
+    def fill(self, c):
+        for y in range(self.h):
+            for x in range(self.w):
+                self.pixel(x, y, c)
+
+    def text(self, s, x, y, c):
+        for i, ch in enumerate(s):
+            for k in range(8):
+                if (ord(ch) >> k) & 1:
+                    self.pixel(x + i * 8 + k, y + k, c)
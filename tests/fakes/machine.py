@@ -0,0 +1,127 @@
+"""Host stand-in for the parts of MicroPython's machine module we use."""
+
+
+class Pin:
+    OUT = 1
+    IN = 0
+    PULL_UP = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, pin=None, mode=None, pull=None, value=1):
+        self.id = pin
+        self.v = value
+        self.handler = None
+        self.trigger = 0
+        self.hard = False
+
+    def init(self, mode=None, pull=None, value=None):
+        if value is not None:
+            self.v = value
+
+    def __call__(self, v=None):
+        if v is None:
+            return self.v
+        self.v = v
+
+    def value(self, v=None):
+        return self(v)
+
+    def irq(self, trigger=None, handler=None, hard=False):
+        self.trigger = trigger
+        self.handler = handler
+        self.hard = hard
+
+    def drive(self, v):
+        """Set the level and fire the IRQ handler on a matching edge."""
+        old, self.v = self.v, v
+        if self.handler is None or old == v:
+            return
+        if (v == 0 and self.trigger & self.IRQ_FALLING or
+                v == 1 and self.trigger & self.IRQ_RISING):
+            self.handler(self)
+
+
+class PWM:
+    def __init__(self, pin, freq=0, duty=None):
+        self.pin = pin
+        self.freq = freq
+        self.value = None  # Last duty written, in the units used
+        self.writes = 0
+        self.released = False
+
+    def _set(self, v):
+        if v is None:
+            return self.value
+        self.value = v
+        self.writes += 1
+
+    def duty(self, v=None):
+        return self._set(v)
+
+    def duty_u16(self, v=None):
+        return self._set(v)
+
+    def deinit(self):
+        self.released = True
+
+
+class ADC:
+    ATTN_11DB = 3
+    WIDTH_12BIT = 3
+
+    def __init__(self, pin):
+        self.pin = pin
+        self.source = lambda: 0  # Returns the next 16-bit sample
+
+    def atten(self, a):
+        pass
+
+    def width(self, w):
+        pass
+
+    def read_u16(self):
+        return self.source()
+
+    def read(self):
+        return self.source() >> 4
+
+
+class Timer:
+    PERIODIC = 1
+    ONE_SHOT = 0
+
+    def __init__(self, timer_id=0):
+        self.callback = None
+        self.period = None
+
+    def init(self, period=0, mode=PERIODIC, callback=None):
+        self.period = period
+        self.callback = callback
+
+    def fire(self):
+        """Run one period; False once the timer has been deinited."""
+        if self.callback is None:
+            return False
+        self.callback(self)
+        return True
+
+    def deinit(self):
+        self.callback = None
+
+
+class I2C:
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+def reset():
+    raise SystemExit('machine.reset()')
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state):
+    pass
@@ -0,0 +1,71 @@
+"""Button IRQ debounce against a fake pin and clock."""
+import pytest
+
+import libs.button
+from libs.button import Button
+
+
+@pytest.fixture
+def clock(clock, monkeypatch):
+    # Button takes its ticks from the scheduler shims, not from time
+    monkeypatch.setattr(libs.button, 'ticks_ms', clock.ticks_ms)
+    monkeypatch.setattr(libs.button, 'ticks_add', lambda a, b: a + b)
+    monkeypatch.setattr(libs.button, 'ticks_diff', lambda a, b: a - b)
+    return clock
+
+
+@pytest.fixture
+def button(clock):
+    return Button(12, debounce_ms=100, irq=True)
+
+
+def edges(button, clock, script):
+    """Drive the pin through (ms, level) steps."""
+    for ms, level in script:
+        clock.now = ms
+        button.pin.drive(level)
+
+
+def test_long_click_with_release_bounce_is_one_press(button, clock):
+    edges(button, clock, [(1000, 0), (1150, 1), (1151, 0), (1152, 1),
+                          (1153, 0), (1155, 1)])
+    assert button.events() == 1
+    assert button.press_time == 1000
+
+
+def test_press_bounce_is_one_press(button, clock):
+    edges(button, clock, [(1000, 0), (1001, 1), (1002, 0), (1060, 1)])
+    assert button.events() == 1
+
+
+def test_separate_clicks_all_count(button, clock):
+    edges(button, clock, [(1000, 0), (1050, 1), (1200, 0), (1250, 1),
+                          (1400, 0), (1450, 1)])
+    assert button.was_pressed()
+    assert button.was_pressed()
+    assert button.was_pressed()
+    assert not button.was_pressed()
+
+
+def test_quick_repress_is_rejected(button, clock):
+    edges(button, clock, [(1000, 0), (1050, 1), (1100, 0), (1150, 1)])
+    assert button.events() == 1
+
+
+def test_full_queue_drops(clock):
+    button = Button(12, debounce_ms=10, irq=True, queue_size=2)
+    for i in range(4):
+        edges(button, clock, [(1000 + i * 100, 0), (1050 + i * 100, 1)])
+    assert button.events() == 2
+    assert button.dropped == 2
+
+
+def test_press_read_high_by_the_isr_still_counts(button, clock):
+    # Each step is one edge's ISR and the level it reads.  The first
+    # falling edge's ISR only runs after the contact bounced back high.
+    for ms, level in [(1000, 1), (1000, 1), (1001, 0), (1200, 1)]:
+        clock.now = ms
+        button.pin.v = level
+        button._isr(button.pin)
+    assert button.events() == 1
+    assert button.press_time == 1000
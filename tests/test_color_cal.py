@@ -0,0 +1,66 @@
+"""Calibration fit and fixed-point apply on synthetic captures."""
+import pytest
+
+from libs.color_cal import ColorCalibration, srgb_decode
+from tools.fit_color_cal import fit
+
+# Sensor response to linear R, G, B light, with some crosstalk
+RESPONSE = ((0.80, 0.15, 0.05), (0.10, 0.75, 0.20), (0.05, 0.20, 0.70))
+SWATCHES = [
+    (255, 255, 255), (128, 128, 128), (64, 64, 64), (200, 200, 200),
+    (255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (0, 255, 255),
+    (200, 120, 40), (40, 90, 160),
+]
+EXPOSURES = [(16, 24), (4, 98.4), (60, 48)]
+
+
+def capture(ref, exposure, light=20.0):
+    """Raw counts for a swatch; clear is the sum of the channels."""
+    gain, ms = exposure
+    linear = [srgb_decode(v / 255) for v in ref]
+    rgb = [int(light * gain * ms * sum(k * v for k, v in zip(row, linear)))
+           for row in RESPONSE]
+    return rgb + [sum(rgb)]
+
+
+def samples():
+    out = []
+    for i, ref in enumerate(SWATCHES):
+        exposure = EXPOSURES[i % len(EXPOSURES)]
+        out.append(capture(ref, exposure) + list(exposure) + list(ref))
+    return out
+
+
+def test_fit_keeps_intensity():
+    captures = samples()
+    matrix, white = fit(captures)
+    cal = ColorCalibration.from_floats(matrix, white)
+    worst = 0
+    for s in captures:
+        got = cal.apply(s[:4], (s[4], s[5]))
+        worst = max(worst, max(abs(a - b) for a, b in zip(got, s[6:9])))
+    assert worst <= 1
+
+
+def test_greys_differ_at_any_exposure():
+    matrix, white = fit(samples())
+    cal = ColorCalibration.from_floats(matrix, white)
+    for exposure in EXPOSURES:
+        grey = cal.apply(capture((128, 128, 128), exposure), exposure)
+        assert all(abs(v - 128) <= 2 for v in grey)
+
+
+def test_fit_needs_white():
+    captures = [s for s in samples() if min(s[6:9]) < 250]
+    with pytest.raises(ValueError):
+        fit(captures)
+
+
+def test_round_trip(tmp_path):
+    cal = ColorCalibration.from_floats(
+        [[1.1, -0.1, 0], [0, 1, 0], [0, -0.05, 1.05]], (1.5, 2.0, 2.5))
+    path = str(tmp_path / 'cal.json')
+    cal.save(path)
+    loaded = ColorCalibration.load(path)
+    assert loaded.matrix == cal.matrix
+    assert loaded.white == cal.white
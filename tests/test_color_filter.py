@@ -0,0 +1,66 @@
+"""ColorFilter median window, EMA and settle detection."""
+import random
+
+from libs.color_filter import ColorFilter
+
+
+def grey(v):
+    return (v, v, v, min(65535, 3 * v))
+
+
+def test_median_matches_sorted_window():
+    rng = random.Random(4)
+    for window in (1, 2, 5, 8):
+        f = ColorFilter(window=window)
+        history = []
+        for _ in range(300):
+            sample = tuple(rng.choice((0, 7, 7, 100, 65535, rng.randint(
+                0, 65535))) for _ in range(4))
+            f.feed(sample)
+            history.append(sample)
+            recent = history[-window:]
+            for ch in range(4):
+                run = f._sorted[ch * window:ch * window + len(recent)]
+                assert list(run) == sorted(s[ch] for s in recent)
+
+
+def test_single_spike_is_rejected():
+    f = ColorFilter(window=5)
+    for _ in range(10):
+        f.feed(grey(1000))
+    before = tuple(f.value)
+    f.feed(grey(60000))
+    assert tuple(f.value) == before
+    f.feed(grey(0))
+    assert tuple(f.value) == before
+    assert f.settled
+
+
+def test_step_change_is_followed():
+    f = ColorFilter(window=5, ema_shift=2)
+    for _ in range(10):
+        f.feed(grey(1000))
+    f.feed(grey(2000))
+    f.feed(grey(2000))
+    assert f.value[0] == 1000  # Median still on the old level
+    f.feed(grey(2000))
+    assert 1000 < f.value[0] < 2000  # Majority moved, EMA on its way
+    assert not f.settled
+    for _ in range(30):
+        f.feed(grey(2000))
+    assert abs(f.value[0] - 2000) <= 4
+    assert f.settled
+
+
+def test_settled_after_settle_count_samples():
+    f = ColorFilter(window=3, settle_count=4)
+    flags = []
+    for _ in range(6):
+        f.feed(grey(500))
+        flags.append(f.settled)
+    # First sample seeds the EMA, then four stable samples in a row
+    assert flags == [False, False, False, False, True, True]
+    f.reset()
+    assert not f.settled
+    f.feed(grey(500))
+    assert not f.settled
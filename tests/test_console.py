@@ -0,0 +1,46 @@
+"""Console line splitting against a recording display."""
+from libs.console import Console
+
+
+class FakeDisplay:
+    width = 240
+    height = 320
+
+    def __init__(self):
+        self.lines = []
+
+    def set_scroll(self, top, bottom):
+        pass
+
+    def scroll(self, y):
+        pass
+
+    def fill_hrect(self, x, y, w, h, color):
+        pass
+
+    def draw_text8x8(self, x, y, text, color, background):
+        self.lines.append(text.rstrip())
+
+
+def make_console():
+    display = FakeDisplay()
+    console = Console(display)
+    return console, display.lines
+
+
+def test_trailing_newline_takes_one_row():
+    console, lines = make_console()
+    console.write('foo\n')
+    assert lines == ['foo']
+
+
+def test_interior_blank_lines_are_kept():
+    console, lines = make_console()
+    console.write('a\n\nb')
+    assert lines == ['a', '', 'b']
+
+
+def test_long_lines_wrap():
+    console, lines = make_console()
+    console.write('x' * (console.cols + 3))
+    assert lines == ['x' * console.cols, 'xxx']
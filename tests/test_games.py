@@ -0,0 +1,120 @@
+"""Play a game through the Runtime on the host, with a scripted player.
+
+Everything runs under CPython asyncio on a clock sped up SPEED times, so
+the game's pauses and the scheduler's rates keep their proportions while
+a full game takes a fraction of a second.
+"""
+import asyncio
+import io
+import random
+import time
+
+import pytest
+
+import libs.button
+import libs.fsm
+import libs.runtime
+import libs.scheduler
+from board import FakeHardware
+from games import game1
+from libs.fsm import Machine
+from libs.runtime import Runtime
+from libs.ui import ui
+
+SPEED = 20
+
+
+class FastClock:
+    def __init__(self, speed):
+        self.speed = speed
+        self.start = time.monotonic()
+
+    def ticks_us(self):
+        return int((time.monotonic() - self.start) * 1e6 * self.speed)
+
+    def ticks_ms(self):
+        return self.ticks_us() // 1000
+
+    def sleep_ms(self, ms):
+        return asyncio.sleep(ms / 1000 / self.speed)
+
+
+@pytest.fixture
+def fast_clock(monkeypatch):
+    clock = FastClock(SPEED)
+    monkeypatch.setattr(libs.scheduler, 'ticks_us', clock.ticks_us)
+    monkeypatch.setattr(libs.scheduler, 'sleep_ms', clock.sleep_ms)
+    for module in (libs.runtime, libs.fsm, libs.button):
+        monkeypatch.setattr(module, 'ticks_ms', clock.ticks_ms)
+    for module in (libs.runtime, libs.fsm):
+        monkeypatch.setattr(module, 'sleep_ms', clock.sleep_ms)
+    return clock
+
+
+@pytest.fixture
+def output(monkeypatch):
+    stream = io.BytesIO()
+    monkeypatch.setattr(ui, 'stream', stream)
+    monkeypatch.setattr(ui, '_flush', None)
+    return stream
+
+
+@pytest.fixture
+def machines(monkeypatch):
+    """Every state machine started, newest last."""
+    started = []
+    goto = Machine.goto
+
+    def tracking_goto(self, key):
+        if not started or started[-1] is not self:
+            started.append(self)
+        goto(self, key)
+
+    monkeypatch.setattr(Machine, 'goto', tracking_goto)
+    return started
+
+
+async def game1_player(rt, machines):
+    """Match each target exactly, taking one hint in the first round."""
+    hw = rt.hw
+    hinted = False
+    while True:
+        await libs.runtime.sleep_ms(50)
+        if not machines:
+            continue
+        m = machines[-1]
+        if m.key == game1.MIXING:
+            hw.set_mix(*m.target_rgb)
+            if not hinted:
+                await hw.press(hw.hint_btn)
+                hinted = True
+            while tuple(rt.mix) != m.target_rgb:  # Watch the LED
+                await libs.runtime.sleep_ms(20)
+            await hw.press(hw.lock_btn)
+        elif m.key in (game1.RESULT, game1.COMPLETE):
+            await hw.press(hw.hint_btn)
+
+
+def test_game1_plays_through(fast_clock, output, machines):
+    random.seed(7)
+    hw = FakeHardware()
+
+    async def main():
+        rt = Runtime(hw)
+        player = asyncio.create_task(game1_player(rt, machines))
+        try:
+            return await asyncio.wait_for(
+                rt.run(game1.start_game(rt, player_num=1)), 10)
+        finally:
+            player.cancel()
+
+    with hw:
+        score = asyncio.run(main())
+    game = machines[-1]
+    assert [e['hints'] for e in game.score_history] == [1, 0]
+    assert game.current_rgb == game.target_rgb
+    assert score == game.total_score == 95 + 100
+    text = output.getvalue().decode()
+    assert 'HINT #1 - COMPARISON' in text
+    assert 'GAME 1 COMPLETE - PLAYER 1' in text
+    assert text.count('ROUND SCORE') == 2
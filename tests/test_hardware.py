@@ -0,0 +1,17 @@
+"""Hardware setup and teardown against the machine fakes."""
+import pytest
+
+from libs.hardware import Hardware
+
+
+def test_leaving_the_with_block_releases_everything(clock):
+    with pytest.raises(KeyboardInterrupt):
+        with Hardware() as hw:
+            buttons = (hw.restart_btn, hw.lock_btn, hw.hint_btn)
+            assert all(b.pin.handler is not None for b in buttons)
+            raise KeyboardInterrupt
+    assert all(b.pin.handler is None for b in buttons)
+    assert not any(b.irq for b in buttons)
+    rgb = hw.rgb
+    assert all(pwm.released for pwm in (rgb.pwm_r, rgb.pwm_g, rgb.pwm_b))
+    assert rgb.pwm_r.value == 65535  # Common anode: off
@@ -0,0 +1,347 @@
+"""ILI9341 block path: wire format and allocation checks on the host."""
+import tracemalloc
+
+import libs.ili9341 as ili9341
+from machine import Pin
+
+
+class NullSPI:
+    def write(self, data):
+        pass
+
+
+class RecordingSPI:
+    def __init__(self):
+        self.log = []
+
+    def write(self, data):
+        self.log.append(bytes(data))
+
+
+def make_display(spi):
+    ili9341.sleep = lambda s: None
+    return ili9341.Display(spi, Pin(), Pin(), Pin())
+
+
+def peak_alloc(fn, n=1000):
+    """Peak traced bytes while calling fn n times (after a warm-up)."""
+    for _ in range(10):
+        fn()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for _ in range(n):
+            fn()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def test_block_matches_command_sequence():
+    spi = RecordingSPI()
+    display = make_display(spi)
+    data = bytes(8)
+    spi.log = []
+    display._write_block_mpy(1, 2, 300, 4, data)
+    fast = spi.log
+    spi.log = []
+    display._write_block_cpy(1, 2, 300, 4, data)
+    assert b''.join(fast) == b''.join(spi.log)
+
+
+def test_block_does_not_allocate():
+    display = make_display(NullSPI())
+    display._write_block = display._write_block_mpy
+    data = bytearray(64)
+    baseline = peak_alloc(lambda: None)
+    assert peak_alloc(lambda: display.block(1, 2, 300, 4, data)) <= baseline
+
+
+def test_write_cmd_reuses_argument_buffer():
+    display = make_display(RecordingSPI())
+    views = display._args_views
+    display.write_cmd(display.SET_COLUMN, 0, 1, 0, 2)
+    assert display._args_views is views
+    assert bytes(views[4]) == b'\x00\x01\x00\x02'
+
+
+class Panel:
+    """Panel RAM image fed by the display's block writes.
+
+    ``written`` counts block writes per pixel so tests can check which
+    pixels ever reached the panel.
+    """
+
+    def __init__(self, display):
+        self.w = display.width
+        self.h = display.height
+        self.image = bytearray(self.w * self.h * 2)
+        self.written = bytearray(self.w * self.h)
+        self.blocks = 0
+        self.pixels = 0
+        display._write_block = self.write
+
+    def write(self, x0, y0, x1, y1, data):
+        self.blocks += 1
+        self.pixels += (x1 - x0 + 1) * (y1 - y0 + 1)
+        data = bytes(data)
+        n = (x1 - x0 + 1) * 2
+        assert len(data) == n * (y1 - y0 + 1)
+        for row, y in enumerate(range(y0, y1 + 1)):
+            start = (y * self.w + x0) * 2
+            self.image[start:start + n] = data[row * n:row * n + n]
+            for x in range(x0, x1 + 1):
+                self.written[y * self.w + x] = 1
+
+
+def draw_scene(display):
+    display.fill_rectangle(10, 50, 30, 20, 0xF800)
+    display.draw_circle(120, 80, 25, 0x07E0)
+    display.fill_circle(60, 100, 12, 0x001F)
+    display.draw_line(0, 40, 239, 110, 0xFFFF)
+    display.draw_text8x8(150, 60, 'Mix', 0xFFE0, background=0x0010)
+    display.fill_polygon_coords([(180, 70), (230, 90), (200, 75),
+                                 (190, 110)], 0x07FF)
+    display.draw_pixel(5, 45, 0x1234)
+    # Partly outside the band: the rest must go straight to the panel
+    display.fill_rectangle(100, 20, 20, 40, 0x8410)
+
+
+def direct_panel():
+    display = make_display(NullSPI())
+    panel = Panel(display)
+    draw_scene(display)
+    return panel
+
+
+def test_buffer_flush_matches_direct_drawing():
+    expected = direct_panel()
+    display = make_display(NullSPI())
+    panel = Panel(display)
+    display.buffer_on(0, 40, 240, 80, max_rects=3)
+    draw_scene(display)
+    display.buffer_off()
+    assert panel.image == expected.image
+
+
+def test_filled_buffer_matches_drawing_on_background():
+    for color in (0, 0x4208):
+        # Reference: the band filled with the background, then the scene
+        reference = make_display(NullSPI())
+        expected = Panel(reference)
+        reference.fill_rectangle(0, 40, 240, 80, color)
+        draw_scene(reference)
+        drawn = direct_panel().written
+        display = make_display(NullSPI())
+        panel = Panel(display)
+        display.buffer_on(0, 40, 240, 80, max_rects=3, color=color)
+        draw_scene(display)
+        display.buffer_off()
+        for i, hit in enumerate(panel.written):
+            # Merged boxes may also push background pixels, never garbage
+            if hit:
+                assert panel.image[i * 2:i * 2 + 2] == \
+                    expected.image[i * 2:i * 2 + 2], (i % 240, i // 240)
+            assert hit or not drawn[i], (i % 240, i // 240)
+
+
+def test_unfilled_buffer_only_writes_drawn_pixels():
+    expected = direct_panel()
+    for max_rects in (1, 2, 8):
+        display = make_display(NullSPI())
+        panel = Panel(display)
+        display.buffer_on(0, 40, 240, 80, max_rects=max_rects)
+        draw_scene(display)
+        display.buffer_off()
+        for i, hit in enumerate(panel.written):
+            if hit:
+                assert expected.written[i], (i % 240, i // 240)
+        assert panel.image == expected.image
+
+
+def pixel_by_pixel(display):
+    """Make shape drawing fall back to one draw_pixel() per point."""
+    def begin(color):
+        return lambda x, y: display.draw_pixel(x, y, color)
+    display._begin_pixels = begin
+    display._end_pixels = lambda: None
+
+
+def transactions(shape, args, baseline=False):
+    """RAM writes sent for one shape, and the resulting panel image."""
+    spi = RecordingSPI()
+    display = make_display(spi)
+    display._write_block = display._write_block_mpy
+    if baseline:
+        pixel_by_pixel(display)
+    spi.log = []
+    getattr(display, shape)(*args)
+    ram = bytes((display.WRITE_RAM,))
+    count = sum(1 for chunk in spi.log if chunk == ram)
+    image = make_display(NullSPI())
+    panel = Panel(image)
+    if baseline:
+        pixel_by_pixel(image)
+    getattr(image, shape)(*args)
+    return count, panel.image
+
+
+def test_circle_and_ellipse_batch_pixels_into_runs():
+    for shape, args, most in (('draw_circle', (120, 160, 50, 0xF800), 116),
+                              ('draw_ellipse', (120, 160, 60, 30, 0x07E0),
+                               92)):
+        count, image = transactions(shape, args)
+        base_count, base_image = transactions(shape, args, baseline=True)
+        assert image == base_image
+        assert count <= most
+        assert count * 2 < base_count
+
+
+def even_odd(coords, x, y):
+    """Reference fill: even-odd crossings of the row through (x, y).
+
+    An edge counts when it spans [top, bottom) and crosses at or left of
+    x, which is the same top-left rule fill_polygon_coords uses.
+    """
+    inside = False
+    xa, ya = coords[-1]
+    for xb, yb in coords:
+        if ya != yb:
+            (x0, y0), (x1, y1) = sorted(((xa, ya), (xb, yb)),
+                                        key=lambda c: c[1])
+            if y0 <= y < y1 and (x0 - x) * (y1 - y0) + \
+                    (x1 - x0) * (y - y0) <= 0:
+                inside = not inside
+        xa, ya = xb, yb
+    return inside
+
+
+def test_fill_polygon_coords_matches_even_odd_reference():
+    polygons = (
+        # Concave arrow with a notch and a spike
+        [(20, 20), (120, 40), (60, 70), (130, 130), (30, 110), (50, 60)],
+        # Star
+        [(120, 100), (140, 160), (200, 165), (150, 195), (170, 250),
+         (120, 215), (70, 250), (90, 195), (40, 165), (100, 160)],
+        # Clipped on every side of the screen
+        [(-40, -30), (150, 10), (280, -20), (200, 150), (290, 300),
+         (100, 230), (-30, 340), (30, 140)],
+        # Entirely off screen
+        [(-50, 10), (-10, 40), (-30, 80)],
+    )
+    for coords in polygons:
+        display = make_display(NullSPI())
+        panel = Panel(display)
+        display.fill_polygon_coords(coords, 0xFFFF)
+        expected = bytearray(panel.w * panel.h)
+        for y in range(panel.h):
+            for x in range(panel.w):
+                if even_odd(coords, x, y):
+                    expected[y * panel.w + x] = 1
+        assert panel.written == expected
+        # Every pixel is written exactly once, one block per span
+        assert panel.pixels == sum(expected)
+
+
+class StripeFont:
+    """XglcdFont stand-in: 8 rows high, width varies by letter.
+
+    Landscape glyphs are the portrait ones turned a quarter left, so the
+    block is h wide and w high, like XglcdFont.
+    """
+
+    height = 8
+
+    def get_letter(self, letter, color, background=0, landscape=False):
+        if letter == '~':
+            return None, 0, 0
+        code = ord(letter)
+        w = 3 + code % 4
+        h = self.height
+        fg = color.to_bytes(2, 'big')
+        bg = background.to_bytes(2, 'big')
+
+        def lit(x, y):
+            return (x * 7 + y * 3 + code) % 3 == 0
+
+        if landscape:
+            buf = b''.join(fg if lit(w - 1 - by, bx) else bg
+                           for by in range(w) for bx in range(h))
+        else:
+            buf = b''.join(fg if lit(x, y) else bg
+                           for y in range(h) for x in range(w))
+        return bytearray(buf), w, h
+
+
+def test_glyph_cache_evicts_least_recently_used_within_budget():
+    cache = ili9341.GlyphCache(30)
+    for key in 'abc':
+        cache.put(key, (bytearray(10), 5, 1))
+    assert cache.size == 30 and len(cache) == 3
+    assert cache.get('a') is not None  # a is now the newest
+    cache.put('d', (bytearray(10), 5, 1))
+    assert cache.get('b') is None
+    assert [k for k in 'acd' if cache.get(k) is not None] == list('acd')
+    assert cache.evictions == 1
+    # A bigger entry pushes out as many of the oldest as it needs
+    cache.put('e', (bytearray(20), 10, 1))
+    assert cache.size == 30 and cache.evictions == 3
+    assert cache.get('a') is None and cache.get('c') is None
+    assert cache.get('d') is not None and cache.get('e') is not None
+    # Replacing a key re-counts its size; oversize entries are not kept
+    cache.put('d', (bytearray(4), 2, 1))
+    assert cache.size == 24
+    cache.put('f', (bytearray(31), 31, 1))
+    assert cache.get('f') is None and cache.size == 24
+
+
+def test_glyph_cache_counts_hits_and_misses():
+    cache = ili9341.GlyphCache(100)
+    assert cache.get('a') is None
+    cache.put('a', (bytearray(2), 1, 1))
+    assert cache.get('a') is not None
+    assert cache.get('a') is not None
+    assert (cache.hits, cache.misses) == (2, 1)
+    cache.clear()
+    assert cache.get('a') is None
+    assert (cache.hits, cache.misses, len(cache), cache.size) == (2, 2, 0, 0)
+
+
+def test_draw_label_matches_draw_text():
+    font = StripeFont()
+    for landscape, rotate_180 in ((False, False), (True, False),
+                                  (False, True), (True, True)):
+        for background, spacing in ((0, 1), (0x0841, 1), (0x0841, 3),
+                                    (0xF800, 0)):
+            x, y = 20, 200
+            args = ('Mix it', font, 0xFFFF, background, landscape,
+                    rotate_180, spacing)
+            text_display = make_display(NullSPI())
+            expected = Panel(text_display)
+            text_display.draw_text(x, y, *args)
+            for cached in (False, True):
+                display = make_display(NullSPI())
+                panel = Panel(display)
+                if cached:
+                    display.text_cache_on()
+                display.draw_label(x, y, *args)
+                assert panel.blocks == 1
+                assert panel.written == expected.written
+                assert panel.image == expected.image
+                if cached:
+                    # The second draw is served from the label cache
+                    display.draw_label(x, y, *args)
+                    assert display.label_cache.hits == 1
+                    assert panel.image == expected.image
+
+
+def test_draw_label_stops_at_a_missing_letter():
+    font = StripeFont()
+    expected = make_display(NullSPI())
+    expected_panel = Panel(expected)
+    expected.draw_text(10, 10, 'ab~cd', font, 0xFFFF, 0x0841)
+    display = make_display(NullSPI())
+    panel = Panel(display)
+    display.draw_label(10, 10, 'ab~cd', font, 0xFFFF, 0x0841)
+    assert panel.image == expected_panel.image
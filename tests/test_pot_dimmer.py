@@ -0,0 +1,80 @@
+"""PotDimmer filtering against a scripted ADC."""
+import random
+
+from libs.pot_dimmer import PotDimmer
+
+
+def make_pot(level, noise=0, seed=1, **kwargs):
+    """A dimmer whose ADC reads level (0-255 scale) plus gaussian noise."""
+    pot = PotDimmer(32, 15, **kwargs)
+    rng = random.Random(seed)
+    state = {'level': level}
+
+    def sample():
+        v = state['level'] * 257 + rng.gauss(0, noise)
+        return max(0, min(65535, int(v)))
+
+    pot.adc.source = sample
+    return pot, state
+
+
+def settle(pot, n=50):
+    for _ in range(n):
+        value = pot.update()
+    return value
+
+
+def count_changes(pot, n=5000):
+    changes = 0
+    last = pot.update()
+    for _ in range(n):
+        value = pot.update()
+        changes += value != last
+        last = value
+    return changes
+
+
+def test_noise_rejection():
+    # ~900 LSB of 16-bit noise is ~3.5 output steps
+    raw, _ = make_pot(120, noise=900, oversample=1, smoothing=0,
+                      hysteresis=0)
+    filtered, _ = make_pot(120, noise=900)
+    assert count_changes(raw) > 1000
+    assert count_changes(filtered) < 20
+    assert abs(filtered.update() - 120) <= 2
+
+
+def test_slow_turn_ends_on_target():
+    pot, state = make_pot(100)
+    settle(pot)
+    for level in range(100, 201):
+        state['level'] = level
+        pot.update()
+    assert settle(pot) == 200
+
+
+def test_ends_reachable_and_stable():
+    pot, state = make_pot(253, noise=200)
+    assert settle(pot) == 255
+    assert count_changes(pot, 2000) == 0
+    state['level'] = 1
+    assert settle(pot) == 0
+    assert count_changes(pot, 2000) == 0
+
+
+def test_pwm_written_only_on_change():
+    pot, _ = make_pot(80)
+    settle(pot)
+    writes = pot.led.writes
+    settle(pot)
+    assert pot.led.writes == writes
+
+
+def test_slow_turn_down_ends_on_target():
+    pot, state = make_pot(200)
+    settle(pot)
+    for level in range(200, 149, -1):
+        state['level'] = level
+        pot.update()
+        pot.update()
+    assert settle(pot) == 150
@@ -0,0 +1,73 @@
+"""RGBLED fade/flash engine stepped on a fake timer."""
+from libs.rgb_led import RGBLED
+
+
+def make_led():
+    return RGBLED(15, 2, 17, invert=False, gamma=None)
+
+
+def run_timer(led):
+    """Fire the animation timer until it stops; return colors shown."""
+    timer = led._timer
+    seen = []
+    while timer.fire():
+        seen.append(tuple(led._last))
+    return seen
+
+
+def test_fade_hits_endpoints():
+    led = make_led()
+    led.set_color(0, 0, 0)
+    led.fade_to(255, 100, 10, 100, fps=50)
+    assert led._timer.period == 20
+    seen = run_timer(led)
+    assert len(seen) == 5  # 100 ms at 50 fps
+    assert seen[-1] == (255, 100, 10)
+    assert not led.is_animating()
+    assert led.pwm_r.duty_u16() == 255 * 257
+
+
+def test_fade_is_monotonic():
+    led = make_led()
+    led.set_color(10, 200, 0)
+    led.fade_to(250, 20, 0, 500, fps=50)
+    seen = run_timer(led)
+    reds = [c[0] for c in seen]
+    greens = [c[1] for c in seen]
+    assert reds == sorted(reds) and greens == sorted(greens, reverse=True)
+    assert seen[-1] == (250, 20, 0)
+
+
+def test_flash_ends_off():
+    led = make_led()
+    led.flash(255, 0, 0, times=2, on_ms=40, off_ms=40, timer_id=None)
+    seen = []
+    while led.tick():
+        seen.append(tuple(led._last))
+    assert (255, 0, 0) in seen
+    assert tuple(led._last) == (0, 0, 0)
+
+
+def test_empty_keyframes_do_nothing():
+    led = make_led()
+    led.set_color(1, 2, 3)
+    led.play([])
+    assert not led.is_animating()
+    assert not led.tick()
+    assert tuple(led._last) == (1, 2, 3)
+
+
+def test_set_color_cancels_animation():
+    led = make_led()
+    led.fade_to(255, 255, 255, 1000)
+    timer = led._timer
+    led.set_color(0, 0, 0)
+    assert not led.is_animating()
+    assert not timer.fire()
+
+
+def test_zero_flashes_do_nothing():
+    led = make_led()
+    led.flash(255, 0, 0, times=0)
+    assert not led.is_animating()
+    assert led._timer is None
@@ -0,0 +1,56 @@
+"""TickScheduler loop on a fake microsecond clock."""
+import asyncio
+
+import libs.scheduler as scheduler
+from libs.scheduler import TickScheduler
+
+
+class FakeTime:
+    def __init__(self):
+        self.us = 0
+        self.sleeps = []
+
+    def ticks_us(self):
+        return self.us
+
+    async def sleep_ms(self, ms):
+        self.sleeps.append(ms)
+        self.us += ms * 1000
+        if len(self.sleeps) >= 50:
+            raise asyncio.CancelledError
+
+
+def run_loop(monkeypatch, sched, fake):
+    monkeypatch.setattr(scheduler, 'ticks_us', fake.ticks_us)
+    monkeypatch.setattr(scheduler, 'ticks_diff', lambda a, b: a - b)
+    monkeypatch.setattr(scheduler, 'ticks_add', lambda a, b: a + b)
+    monkeypatch.setattr(scheduler, 'sleep_ms', fake.sleep_ms)
+    try:
+        asyncio.run(sched.run())
+    except asyncio.CancelledError:
+        pass
+
+
+def test_sub_ms_remainder_sleeps_instead_of_spinning(monkeypatch):
+    fake = FakeTime()
+    sched = TickScheduler()
+
+    def work():
+        fake.us += 300  # Leaves 4.7 ms to the next 200 Hz tick
+
+    task = sched.add('input', work, 200)
+    run_loop(monkeypatch, sched, fake)
+    assert 0 not in fake.sleeps
+    assert task.runs == len(fake.sleeps)
+    assert task.missed == 0
+
+
+def test_rates_hold_on_the_grid(monkeypatch):
+    fake = FakeTime()
+    sched = TickScheduler()
+    fast = sched.add('fast', lambda: None, 200)
+    slow = sched.add('slow', lambda: None, 50)
+    run_loop(monkeypatch, sched, fake)
+    elapsed_s = fake.us / 1e6
+    assert abs(fast.runs - 200 * elapsed_s) <= 1
+    assert abs(slow.runs - 50 * elapsed_s) <= 1
@@ -0,0 +1,308 @@
+"""TCS34725 driver checks against a register-file I2C fake."""
+import random
+from array import array
+
+import pytest
+from machine import Pin
+
+from libs.tcs34725 import TCS34725, full_scale, html_rgb, html_rgb_batch
+
+
+class FakeI2C:
+    def __init__(self):
+        self.regs = bytearray(32)
+        self.regs[0x12] = 0x44  # Sensor ID
+        self.writes = []
+
+    def readfrom_mem(self, addr, reg, n):
+        reg &= 0x1f
+        return bytes(self.regs[reg:reg + n])
+
+    def readfrom_mem_into(self, addr, reg, buf):
+        reg &= 0x1f
+        buf[:] = self.regs[reg:reg + len(buf)]
+
+    def writeto_mem(self, addr, reg, data):
+        reg &= 0x1f
+        self.regs[reg:reg + len(data)] = data
+        self.writes.append((reg, bytes(data)))
+
+    def writeto(self, addr, data):
+        self.writes.append(bytes(data))
+
+
+class TimedI2C(FakeI2C):
+    """FakeI2C that integrates on the clock like the real sensor.
+
+    With PON and AEN set, cycles of ATIME * 2.4 ms run back to back.  Each
+    finished cycle latches light (counts per ms per unit gain, clipped to
+    full scale) into CDATA, its number into BDATA and sets AVALID; RDATA
+    is 1 when ATIME or CONTROL changed while that cycle was in flight.
+    """
+
+    def __init__(self, clock, light=0):
+        super().__init__()
+        self.clock = clock
+        self.light = light
+        self.cycle = 0
+        self.cycle_start = 0
+        self.mixed = False
+        self.status_reads = 0
+
+    def cycle_ms(self):
+        return (256 - self.regs[0x01]) * 2.4
+
+    def running(self):
+        return self.regs[0x00] & 0x03 == 0x03
+
+    def advance(self):
+        if not self.running():
+            return
+        while self.cycle_start + self.cycle_ms() <= self.clock.now:
+            self.cycle_start += self.cycle_ms()
+            self.cycle += 1
+            self.regs[0x13] |= 0x01
+            cycles = 256 - self.regs[0x01]
+            gain = (1, 4, 16, 60)[self.regs[0x0F] & 0x03]
+            c = min(65535, 1024 * cycles,
+                    int(self.light * gain * self.cycle_ms()))
+            self.regs[0x14:0x1c] = bytes([c & 0xff, c >> 8, int(self.mixed),
+                                          0, 0, 0, self.cycle & 0xff,
+                                          self.cycle >> 8])
+            self.mixed = False
+
+    def readfrom_mem(self, addr, reg, n):
+        self.advance()
+        return super().readfrom_mem(addr, reg, n)
+
+    def readfrom_mem_into(self, addr, reg, buf):
+        self.advance()
+        self.status_reads += 1
+        super().readfrom_mem_into(addr, reg, buf)
+
+    def writeto_mem(self, addr, reg, data):
+        self.advance()
+        was_running = self.running()
+        super().writeto_mem(addr, reg, data)
+        reg &= 0x1f
+        if self.running() and not was_running:
+            self.cycle_start = self.clock.now
+            self.mixed = False
+        elif not self.running():
+            self.regs[0x13] &= ~0x01
+        elif reg in (0x01, 0x0F):
+            self.mixed = True
+
+
+@pytest.fixture
+def sensor(clock):
+    return TCS34725(FakeI2C())
+
+
+@pytest.fixture
+def timed(clock):
+    sensor = TCS34725(TimedI2C(clock))
+    sensor.integration_time(24)
+    return sensor
+
+
+def poll_for(sensor, clock, ms):
+    """Poll every millisecond; return (time, sample) for each new one."""
+    got = []
+    for _ in range(ms):
+        clock.now += 1
+        sample = sensor.poll()
+        if sample is not None:
+            got.append((clock.now, sample))
+    return got
+
+
+def test_in_hold_band_keeps_exposure(sensor):
+    sensor.gain(16)
+    sensor.integration_time(24)
+    assert not sensor.auto_exposure(full_scale(24) // 2)
+    assert (sensor.gain(), sensor.integration_time()) == (16, 24)
+
+
+def test_one_step_lands_in_target_band(sensor):
+    sensor.gain(1)
+    sensor.integration_time(24)
+    rate = 100 / (1 * 24)  # Dim: 100 counts at 1x, 24 ms
+    assert sensor.auto_exposure(100)
+    g, t = sensor.gain(), sensor.integration_time()
+    assert 0.25 <= rate * g * t / full_scale(t) <= 0.75
+
+
+def test_no_fit_does_not_lose_resolution(sensor):
+    # Already at the longest, most sensitive setting and still too dark:
+    # nothing is better, so hold instead of jumping elsewhere
+    sensor.gain(60)
+    sensor.integration_time(614.4)
+    assert not sensor.auto_exposure(3)
+    assert (sensor.gain(), sensor.integration_time()) == (60, 614.4)
+
+
+def test_no_fit_moves_only_closer(sensor):
+    sensor.gain(1)
+    sensor.integration_time(24)
+    assert sensor.auto_exposure(0)
+    assert (sensor.gain(), sensor.integration_time()) == (60, 614.4)
+
+
+def test_gain_change_keeps_integration_time(sensor):
+    sensor.gain(1)
+    sensor.integration_time(24)
+    assert sensor.auto_exposure(194)  # ~2% of full scale
+    assert (sensor.gain(), sensor.integration_time()) == (16, 24)
+
+
+def test_read_into_one_burst(sensor):
+    i2c = sensor.i2c
+    i2c.regs[0x13] = 0x01  # AVALID
+    i2c.regs[0x14:0x1c] = bytes([4, 3, 1, 0, 2, 0, 3, 0])  # C, R, G, B
+    out = [0, 0, 0, 0]
+    calls = []
+    read = i2c.readfrom_mem_into
+    i2c.readfrom_mem_into = lambda *a: calls.append(a) or read(*a)
+    assert sensor.read_into(out)
+    assert out == [1, 2, 3, 0x0304]
+    assert len(calls) == 1
+
+
+def test_read_into_invalid_leaves_output(sensor):
+    out = [9, 9, 9, 9]
+    assert not sensor.read_into(out)
+    assert out == [9, 9, 9, 9]
+
+
+def float_html_rgb(data):
+    """The original float implementation, for reference."""
+    r, g, b, c = data
+    if c == 0:
+        return 0, 0, 0
+    return tuple(int(pow(v / c, 2.5) * 255) for v in (r, g, b))
+
+
+def test_html_rgb_within_one_lsb_of_float():
+    rng = random.Random(1)
+    worst = 0
+    for _ in range(20000):
+        c = rng.randint(1, 65535)
+        data = (rng.randint(0, c), rng.randint(0, c), rng.randint(0, c), c)
+        for got, want in zip(html_rgb(data), float_html_rgb(data)):
+            worst = max(worst, abs(got - want))
+    assert worst <= 1
+
+
+def test_html_rgb_batch_matches_single():
+    rng = random.Random(2)
+    samples = array('H')
+    expected = bytearray()
+    for _ in range(200):
+        c = rng.randint(0, 65535)
+        data = (rng.randint(0, c), rng.randint(0, c), rng.randint(0, c), c)
+        samples.extend(data)
+        expected.extend(html_rgb(data))
+    out = bytearray(len(expected))
+    assert html_rgb_batch(samples, out) == expected
+
+
+def test_attach_irq_programs_band_and_persistence_first(sensor):
+    i2c = sensor.i2c
+    i2c.writes = []
+    pin = Pin(19)
+    sensor.attach_irq(pin, 100, 5000, persistence=0)
+    assert sensor.interrupt_thresholds() == (100, 5000)
+    assert i2c.regs[0x0C] >= 1  # Never "interrupt on every cycle"
+    pers = [n for n, w in enumerate(i2c.writes) if w[0] == 0x0C]
+    aien = [n for n, w in enumerate(i2c.writes)
+            if w[0] == 0x00 and w[1][0] & 0x10]
+    assert pers and aien and pers[-1] < aien[0]
+    assert pin.hard
+
+
+def test_irq_queues_event(sensor, clock):
+    i2c = sensor.i2c
+    pin = Pin(19)
+    seen = []
+    sensor.attach_irq(pin, 100, 5000, handler=seen.append)
+    i2c.regs[0x13] = 0x11  # AINT | AVALID
+    i2c.regs[0x14:0x1c] = bytes([0x70, 0x17, 1, 0, 2, 0, 3, 0])
+    clock.now = 42
+    pin.drive(0)
+    assert sensor.events() == [(42, 1, 2, 3, 6000)]
+    assert seen == [(42, 1, 2, 3, 6000)]
+    assert i2c.writes[-1] == b'\xe6'  # Interrupt cleared
+
+
+def test_poll_returns_nothing_before_a_cycle_completes(timed, clock):
+    assert timed.poll() is None  # Starts continuous mode
+    started = clock.now
+    reads = timed.i2c.status_reads
+    while clock.now - started < timed.integration_time():
+        clock.now += 1
+        assert timed.poll() is None
+    assert timed.i2c.status_reads == reads  # No I2C while integrating
+    assert timed.age_ms() is None
+
+
+def test_poll_returns_each_cycle_once(timed, clock):
+    timed.poll()
+    got = poll_for(timed, clock, 1000)
+    cycles = [sample[2] for _, sample in got]
+    assert cycles == sorted(set(cycles))  # New sample every time
+    # At most the odd cycle is skipped to stay phase-locked
+    assert len(got) >= 1000 // 25 - 2
+    assert all(sample[0] == 0 for _, sample in got)
+    # Nothing is read until the cycle in flight should be done
+    assert timed.i2c.status_reads <= len(got) + 2
+
+
+def test_age_ms_counts_from_the_end_of_the_cycle(timed, clock):
+    timed.poll()
+    while timed.poll() is None:
+        clock.now += 1
+    assert 0 <= timed.age_ms() < 25
+    clock.now += 40
+    assert timed.age_ms() == clock.now - timed.sample_ms
+    assert timed.age_ms() >= 40
+
+
+def test_poll_skips_the_cycle_mixed_by_a_setting_change(timed, clock):
+    timed.poll()
+    poll_for(timed, clock, 60)
+    for change, exposure in ((lambda: timed.gain(4), (4, 24)),
+                             (lambda: timed.integration_time(48), (4, 48))):
+        clock.now += 10  # Mid-cycle
+        change()
+        got = poll_for(timed, clock, 200)
+        assert got
+        assert all(sample[0] == 0 for _, sample in got)
+        assert timed.exposure == exposure
+
+
+def test_integration_time_is_whole_cycles(sensor):
+    for ms, actual in ((50, 48.0), (100, 98.4), (24, 24.0), (1, 2.4),
+                       (700, 614.4), (98.4, 98.4)):
+        assert sensor.integration_time(ms) == actual
+        assert sensor.integration_time() == actual
+        assert sensor.i2c.regs[0x01] == 256 - round(actual / 2.4)
+    assert full_scale(48) == 20 * 1024
+    assert full_scale(98.4) == 41 * 1024
+
+
+def test_saturated_retake_waits_for_a_clean_cycle(clock):
+    sensor = TCS34725(TimedI2C(clock, light=100))
+    sensor.gain(16)
+    sensor.integration_time(24)
+    sensor.poll()
+    clock.now += 100
+    sensor.poll()
+    assert sensor.sample[3] == full_scale(24)  # Saturated
+    before = sensor.i2c.cycle
+    r, g, b, c = sensor.read_normalized()
+    gain, ms = sensor.exposure
+    assert (gain, ms) != (16, 24)
+    assert r == 0  # Not the cycle mixed by the change
+    assert round(b * gain * ms) > before  # BDATA holds the cycle number
+    assert abs(c - 100) < 1
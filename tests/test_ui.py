@@ -0,0 +1,138 @@
+"""UIWriter framing, draining and drop policy against a fake stream."""
+import random
+
+from libs.ui import UIWriter
+
+
+class Stream:
+    def __init__(self):
+        self.data = bytearray()
+        self.writes = 0
+
+    def write(self, b):
+        self.data += b
+        self.writes += 1
+
+
+def make(**kwargs):
+    stream = Stream()
+    return UIWriter(stream, **kwargs), stream
+
+
+def test_print_matches_builtin_formatting():
+    ui, stream = make()
+    ui.print('a', 1, 2.5, sep='-', end='!\n')
+    ui.print()
+    ui.print('ü')
+    ui.flush()
+    assert stream.data == 'a-1-2.5!\n\nü\n'.encode()
+
+
+def test_frame_goes_out_whole_in_budgeted_chunks():
+    ui, stream = make()
+    ui.begin()
+    for i in range(10):
+        ui.print('line', i)
+    ui.end()
+    assert ui.frames == 1 and not stream.data
+    while ui.drain(16):
+        pass
+    assert stream.data == b''.join(b'line %d\n' % i for i in range(10))
+    assert stream.writes > 1
+
+
+def frame(ui, text, key=0):
+    ui.begin(key)
+    ui.print(text)
+    ui.end()
+
+
+def test_full_queue_never_drops_plain_frames():
+    ui, stream = make(capacity=64, latest_wins=True)
+    for i in range(20):
+        ui.print('frame %02d' % i)  # 9 bytes each
+    frame(ui, 'result')
+    ui.flush()
+    assert ui.dropped == 0
+    assert stream.data == b''.join(b'frame %02d\n' % i for i in range(20)) + \
+        b'result\n'
+
+
+def test_newer_dashboard_replaces_unsent_one():
+    ui, stream = make(latest_wins=True)
+    ui.print('prompt')
+    frame(ui, 'hint 1', key=1)
+    frame(ui, 'list 1', key=2)
+    ui.print('banner')
+    frame(ui, 'hint 2', key=1)
+    frame(ui, 'hint 3', key=1)
+    ui.flush()
+    assert stream.data == b'prompt\nlist 1\nbanner\nhint 3\n'
+    assert ui.dropped == 2
+
+
+def test_dashboard_on_the_wire_is_not_cut():
+    ui, stream = make(latest_wins=True)
+    frame(ui, 'hint 1', key=1)
+    ui.drain(3)
+    frame(ui, 'hint 2', key=1)
+    ui.flush()
+    assert stream.data == b'hint 1\nhint 2\n'
+    assert ui.dropped == 0
+
+
+def test_keys_ignored_without_latest_wins():
+    ui, stream = make()
+    frame(ui, 'hint 1', key=1)
+    frame(ui, 'hint 2', key=1)
+    ui.flush()
+    assert stream.data == b'hint 1\nhint 2\n'
+
+
+def test_replacing_across_the_ring_wrap_keeps_order():
+    rng = random.Random(5)
+    ui, stream = make(capacity=50, max_frames=6, latest_wins=True)
+    done = bytearray()  # Model: frames wholly written
+    queue = []  # Model: [text, key] not yet wholly written, oldest first
+    for _ in range(2000):
+        key = rng.choice((0, 0, 1, 2))
+        text = '%d:%s\n' % (key, 'x' * rng.randint(0, 12))
+        started = len(stream.data) - len(done)  # Bytes of queue[0] out
+        if key:
+            queue = [f for n, f in enumerate(queue)
+                     if f[1] != key or (n == 0 and started)]
+        pending = sum(len(f[0]) for f in queue) - started
+        if pending + len(text) > 50 or len(queue) == 6:
+            done += ''.join(f[0] for f in queue).encode()
+            queue = []
+        frame(ui, text[:-1], key)
+        queue.append([text, key])
+        if rng.random() < 0.3:
+            ui.drain(rng.randint(1, 20))
+            while queue and len(done) + len(queue[0][0]) <= len(stream.data):
+                done += queue.pop(0)[0].encode()
+        assert stream.data.startswith(done)
+    ui.flush()
+    done += ''.join(f[0] for f in queue).encode()
+    assert stream.data == done
+    assert ui.dropped > 100
+
+
+def test_oversized_frame_is_truncated():
+    ui, stream = make(capacity=16)
+    ui.begin()
+    ui.print('x' * 10)
+    ui.print('y' * 10)
+    ui.end()
+    ui.flush()
+    assert stream.data == b'x' * 10 + b'\n' + b'y' * 5
+    assert ui.truncated == 1
+
+
+def test_status_keeps_latest_and_waits_for_queue():
+    ui, stream = make()
+    ui.print('hello')
+    ui.status('t=3')
+    ui.status('t=2')
+    ui.drain()
+    assert stream.data == b'hello\nt=2\r'
@@ -0,0 +1,120 @@
+"""Fit a TCS34725 color calibration from recorded samples (runs on the host).
+
+Input is a CSV file with one reference capture per line:
+
+    r,g,b,c,gain,ms,ref_r,ref_g,ref_b
+
+where r,g,b,c are raw sensor counts, gain and ms the exposure they were
+taken at (TCS34725.exposure) and ref_* the known 8-bit sRGB color of the
+swatch.  A white swatch (all references >= 250) is required: its level
+sets both the white balance and the intensity scale, so grey cards come
+out grey rather than white.  The output JSON is what
+libs/color_cal.ColorCalibration.load() reads; copy it to the board with:
+
+    mpremote fs cp color_cal.json :color_cal.json
+"""
+import argparse
+import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from libs.color_cal import CAL_FILE, ColorCalibration, srgb_decode  # noqa: E402
+
+
+def read_samples(path):
+    samples = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip().lstrip("-").isdigit():
+                continue  # Header or blank line
+            values = ([int(v) for v in row[:4]] +
+                      [int(row[4]), float(row[5])] +
+                      [int(v) for v in row[6:9]])
+            if values[3] > 0:
+                samples.append(values)
+    return samples
+
+
+def normalize(s):
+    """Raw r,g,b of a sample in counts per ms per unit gain.
+
+    Same scale as libs.tcs34725.normalize(), which needs the board.
+    """
+    k = 1 / (s[4] * s[5])
+    return [s[i] * k for i in range(3)]
+
+
+def solve3(a, b):
+    """Solve the 3x3 system a x = b by Gauss-Jordan elimination."""
+    m = [list(a[i]) + [b[i]] for i in range(3)]
+    for col in range(3):
+        pivot = max(range(col, 3), key=lambda r: abs(m[r][col]))
+        if abs(m[pivot][col]) < 1e-12:
+            raise ValueError("Samples do not span three colors")
+        m[col], m[pivot] = m[pivot], m[col]
+        for r in range(3):
+            if r != col:
+                k = m[r][col] / m[col][col]
+                m[r] = [x - k * y for x, y in zip(m[r], m[col])]
+    return [m[i][3] / m[i][i] for i in range(3)]
+
+
+def fit(samples):
+    """Return (3x3 matrix, white level) for the samples.
+
+    The white level is the mean normalized r,g,b of the white swatches.
+    Each sample is divided by it, so white maps to (1, 1, 1) and darker
+    neutrals proportionally lower, and the matrix is a least-squares fit
+    from those values to the references in linear light.
+    """
+    whites = [s for s in samples if min(s[6:9]) >= 250]
+    if not whites:
+        raise ValueError("Need a white reference (all channels >= 250)")
+    levels = [normalize(s) for s in whites]
+    white = [sum(v[i] for v in levels) / len(levels) for i in range(3)]
+    xs = [[v / w for v, w in zip(normalize(s), white)] for s in samples]
+    ys = [[srgb_decode(v / 255) for v in s[6:9]] for s in samples]
+    # Normal equations: (X^T X) m_k = X^T y_k for each output channel
+    xtx = [[sum(x[i] * x[j] for x in xs) for j in range(3)]
+           for i in range(3)]
+    matrix = []
+    for k in range(3):
+        xty = [sum(x[i] * y[k] for x, y in zip(xs, ys)) for i in range(3)]
+        matrix.append(solve3(xtx, xty))
+    return matrix, white
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("samples",
+                        help="CSV of r,g,b,c,gain,ms,ref_r,ref_g,ref_b")
+    parser.add_argument("-o", "--output", default=CAL_FILE,
+                        help="calibration file to write (default %(default)s)")
+    args = parser.parse_args()
+
+    samples = read_samples(args.samples)
+    if len(samples) < 3:
+        parser.error("need at least 3 reference captures")
+    try:
+        matrix, white = fit(samples)
+    except ValueError as e:
+        parser.error(str(e))
+    cal = ColorCalibration.from_floats(matrix, white)
+    cal.save(args.output)
+
+    print("White level: {:.3f} {:.3f} {:.3f}".format(*white))
+    worst = 0
+    for s in samples:
+        got = cal.apply(s[:4], (s[4], s[5]))
+        err = max(abs(a - b) for a, b in zip(got, s[6:9]))
+        worst = max(worst, err)
+        print("ref {:3d} {:3d} {:3d} -> {:3d} {:3d} {:3d}".format(
+            *(s[6:9] + list(got))))
+    print("Worst channel error: {}".format(worst))
+    print("Saved {}".format(args.output))
+
+
+if __name__ == "__main__":
+    main()